@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGBatch - parse a corpus of DWG files with a process pool
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+import os
+import time
+import traceback
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from .dwg_common import *
+from .dwg_parser import DWGParser
+
+
+# the number of files handed to the pool ahead of completion (per worker)
+PENDING_PER_WORKER = 4
+
+
+def parse_file(path, mode=DWGParsingMode.METADATA, loading=None):
+    """Parse a DWG file and build a compact result record
+
+        Any exception is caught and stored in the record, so this function
+        never raises for a bad file.
+
+    Args:
+        path (str): The path of a DWG file
+        mode (DWGParsingMode)
+        loading (DWGLoadingMode): None means STREAM for METADATA mode and MEMORY for the others
+
+    Returns:
+        Result record (OrderedDict)
+        {
+            path, name, size   : file info.
+            version            : DWGVersion name
+            result             : return value of DWGParser.parse()
+            error              : None or traceback text
+            metadata           : dict of decoded metadata sections
+            object_map_count   : the number of items in the object map
+            object_count       : the number of decoded objects
+            report             : list of (type, offset, length, desc)
+            time_load          : seconds for loading the file
+            time_parse         : seconds for parsing
+        }
+    """
+    if loading is None:
+        loading = DWGLoadingMode.STREAM if mode == DWGParsingMode.METADATA else DWGLoadingMode.MEMORY
+
+    record = _new_record(path)
+
+    parser = None
+    try:
+        t = time.perf_counter()
+        parser = DWGParser(path, mode, loading)
+        record['size'] = parser.file_size
+        record['time_load'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        record['result'] = parser.parse()
+        record['time_parse'] = time.perf_counter() - t
+
+        fm = parser.get_result()
+        metadata = record['metadata']
+        metadata['summaryinfo'] = fm.dwg_summaryinfo
+        metadata['appinfo'] = fm.dwg_appinfo
+        metadata['appinfohistory'] = fm.dwg_appinfohistory
+        metadata['auxheader'] = fm.dwg_auxheader
+        metadata['filedeplist'] = fm.dwg_filedeplist
+        metadata['security'] = fm.dwg_security
+
+        if fm.dwg_object_map is not None:
+            record['object_map_count'] = len(fm.dwg_object_map)
+        if fm.dwg_objects is not None:
+            record['object_count'] = len(fm.dwg_objects)
+    except Exception:
+        record['error'] = traceback.format_exc()
+
+    if parser is not None:
+        # keep the version and findings detected before an error
+        record['version'] = parser.get_version().name
+        for item in parser.get_result().report.get_vinfo():
+            record['report'].append((item.type.name, item.offset, item.length, item.desc))
+        try:
+            parser.close()
+        except Exception:
+            pass
+
+    return record
+
+
+def _get_file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return -1
+
+
+def _new_record(path, error=None):
+    record = OrderedDict()
+    record['path'] = path
+    record['name'] = os.path.basename(path)
+    record['size'] = -1
+    record['version'] = DWGVersion.UNSUPPORTED.name
+    record['result'] = False
+    record['error'] = error
+    record['metadata'] = OrderedDict()
+    record['object_map_count'] = 0
+    record['object_count'] = 0
+    record['report'] = []
+    record['time_load'] = 0.0
+    record['time_parse'] = 0.0
+    return record
+
+
+def parse_many(paths, mode=DWGParsingMode.METADATA, workers=None, loading=None):
+    """Parse DWG files in parallel and yield a result record per file
+
+        Files are scheduled from the largest to the smallest to cut the tail latency.
+        Records are yielded in completion order (see parse_file() for the format).
+        A file that fails, or even kills its worker process, gets a record
+        with 'error' set and does not stop the batch.
+
+    Args:
+        paths (iterable): Paths of DWG files
+        mode (DWGParsingMode)
+        workers (int): The number of worker processes (default: CPU count),
+                       0 or 1 parses the files in this process
+        loading (DWGLoadingMode): See parse_file()
+
+    Yields:
+        Result record (OrderedDict)
+    """
+    logger = logging.getLogger(__name__)
+
+    paths = sorted(paths, key=_get_file_size, reverse=True)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for path in paths:
+            yield parse_file(path, mode, loading)
+        return
+
+    queue = list(reversed(paths))   # pop() from the end -> the largest first
+    suspects = []
+    max_pending = workers * PENDING_PER_WORKER
+
+    while queue:
+        pending = dict()
+        broken = False
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while queue or pending:
+                while queue and len(pending) < max_pending and not broken:
+                    path = queue.pop()
+                    pending[executor.submit(parse_file, path, mode, loading)] = path
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        record = future.result()
+                    except BrokenProcessPool:
+                        # a worker died (crash, killed by OOM, ...), but which file caused it is unknown
+                        broken = True
+                        suspects.append(path)
+                        continue
+                    except Exception:
+                        record = _new_record(path, traceback.format_exc())
+                        record['size'] = _get_file_size(path)
+                    yield record
+
+                if broken and not pending:
+                    break
+
+        if broken:
+            logger.info("The process pool is broken. Restart it for %d files.", len(queue))
+
+    # files running in a broken pool are parsed again one by one in an own process
+    for path in suspects:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                record = executor.submit(parse_file, path, mode, loading).result()
+            except Exception:
+                record = _new_record(path, "The worker process terminated abruptly.")
+                record['size'] = _get_file_size(path)
+        yield record
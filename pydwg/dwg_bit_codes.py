@@ -19,31 +19,171 @@ import struct
 import logging
 from collections import OrderedDict
 from .dwg_common import *
+from .dwg_record import DWGHandle
+
+
+# precompiled unpackers for byte-aligned reads
+STRUCT_RS = {'little': struct.Struct('<H'), 'big': struct.Struct('>H')}
+STRUCT_RL = {'little': struct.Struct('<I'), 'big': struct.Struct('>HH')}
+STRUCT_RD = {'little': struct.Struct('<d'), 'big': struct.Struct('>d')}
+STRUCT_2RD = {'little': struct.Struct('<2d'), 'big': struct.Struct('>2d')}
+STRUCT_3RD = {'little': struct.Struct('<3d'), 'big': struct.Struct('>3d')}
+
+# read_tv() replaces non-ASCII chars (0x7F-0xFF) with '*'
+TV_CHAR_TABLE = bytes(range(0x7F)) + b'*' * 0x81
 
 
 class DWGBitCodes:
     """DWGBitCodes class
+
+        The position is kept as one absolute bit cursor (self.pos).
+        'pos_byte' and 'pos_bit' are views of it for callers.
+
+        A read which ends before the last bit of the buffer takes the fast path:
+        its bits are taken from one window of bytes with a shift and a mask.
+        Other reads go step by step through update_status(), which keeps the
+        cursor on the last byte at the end of data (see update_status()).
+
+        Raw values (RS, RL, RD, 2RD, 3RD) read at a byte boundary are unpacked
+        directly from the buffer with precompiled struct.Struct objects.
     """
 
     def __init__(self, buf, size, pos_byte=0, pos_bit=0):
         """The constructor"""
         # memory buffer
-        self.buf = buf
-        self.size = size
+        self._buf = buf
+        self._size = size
+        self.update_fast_end()
 
         # status
-        self.pos_byte = pos_byte
-        self.pos_bit  = pos_bit
+        self.pos = (pos_byte << 3) + pos_bit
 
         # global logger
         self.logger = logging.getLogger(__name__)
         return
 
+    @property
+    def buf(self):
+        return self._buf
+
+    @buf.setter
+    def buf(self, value):
+        self._buf = value
+        self.update_fast_end()
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = value
+        self.update_fast_end()
+
+    @property
+    def pos_byte(self):
+        return self.pos >> 3
+
+    @pos_byte.setter
+    def pos_byte(self, value):
+        self.pos = (value << 3) | (self.pos & 0x07)
+
+    @property
+    def pos_bit(self):
+        return self.pos & 0x07
+
+    @pos_bit.setter
+    def pos_bit(self, value):
+        self.pos = (self.pos & ~0x07) + value
+
+    def update_fast_end(self):
+        """Update the bit position where fast reads must end
+
+            A fast read never reaches the last bit of data (where update_status() would stop
+            the cursor) and never touches bytes beyond the buffer.
+        """
+        length = len(self._buf) if self._buf is not None else 0
+        self.fast_end = min((self._size << 3) - 1, length << 3)
+        return
+
+    def read_bits(self, count):
+        """Read 'count' bits as an unsigned integer (MSB first) on the fast path
+
+        Args:
+            count (int): The number of bits
+
+        Returns:
+            Value (int) or None (if the fast path cannot be used)
+        """
+        pos = self.pos
+        end = pos + count
+        if pos < 0 or end > self.fast_end:
+            return None
+
+        self.pos = end
+        idx = pos >> 3
+        last = (end + 7) >> 3
+        value = int.from_bytes(self._buf[idx:last], 'big')
+        return (value >> ((last << 3) - end)) & ((1 << count) - 1)
+
+    def read_run(self, count):
+        """Read a run of 'count' raw chars at once on the fast path
+
+            An unaligned run is read with one extra byte and realigned
+            as one big integer instead of char by char.
+
+        Args:
+            count (int): The number of bytes
+
+        Returns:
+            Data (bytes) or None (if the fast path cannot be used)
+        """
+        pos = self.pos
+        if pos & 0x07 == 0:
+            end = pos + (count << 3)
+            if pos < 0 or end > self.fast_end:
+                return None
+            self.pos = end
+            pos >>= 3
+            return bytes(self._buf[pos:pos+count])
+
+        value = self.read_bits(count << 3)
+        if value is None:
+            return None
+        return value.to_bytes(count, 'big')
+
+    def unpack_aligned(self, st):
+        """Unpack a struct at the current position on the aligned fast path
+
+        Args:
+            st (struct.Struct): A precompiled unpacker
+
+        Returns:
+            Values (tuple) or None (if the cursor is unaligned or near the end of data)
+        """
+        pos = self.pos
+        if pos & 0x07 or pos < 0:
+            return None
+
+        end = pos + (st.size << 3)
+        if end > self.fast_end:
+            return None
+
+        values = st.unpack_from(self._buf, pos >> 3)
+        self.pos = end
+        return values
+
     def read_b(self):
         """Read 1 bit
         """
-        byte = self.buf[self.pos_byte]
-        value = (byte & (0x80 >> self.pos_bit)) >> (7 - self.pos_bit)
+        pos = self.pos
+        if 0 <= pos < self.fast_end:
+            self.pos = pos + 1
+            return (self._buf[pos >> 3] >> (7 - (pos & 0x07))) & 0x01
+
+        pos_byte, pos_bit = pos >> 3, pos & 0x07
+        byte = self._buf[pos_byte]
+        value = (byte & (0x80 >> pos_bit)) >> (7 - pos_bit)
 
         self.update_status(1)
         return value & 0xFF
@@ -51,15 +191,25 @@ class DWGBitCodes:
     def read_bb(self):
         """Read 2 bits
         """
-        byte = self.buf[self.pos_byte]
+        pos = self.pos
+        if 0 <= pos and pos + 2 <= self.fast_end:
+            self.pos = pos + 2
+            idx = pos >> 3
+            shift = pos & 0x07
+            if shift == 7:
+                return ((self._buf[idx] & 0x01) << 1) | (self._buf[idx+1] >> 7)
+            return (self._buf[idx] >> (6 - shift)) & 0x03
+
+        pos_byte, pos_bit = pos >> 3, pos & 0x07
+        byte = self._buf[pos_byte]
 
-        if self.pos_bit == 7:
+        if pos_bit == 7:
             value = (byte & 0x01) << 1
-            if self.pos_byte < self.size - 1:
-                byte = self.buf[self.pos_byte + 1]
+            if pos_byte < self._size - 1:
+                byte = self._buf[pos_byte + 1]
                 value |= (byte & 0x80) >> 7
         else:
-            value = (byte & (0xC0 >> self.pos_bit)) >> (6 - self.pos_bit)
+            value = (byte & (0xC0 >> pos_bit)) >> (6 - pos_bit)
 
         self.update_status(2)
         return value & 0xFF
@@ -105,7 +255,7 @@ class DWGBitCodes:
             value = 0
         elif what_it_is == 0x03:
             msg = "'11' is not used."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return 0
 
         return value & 0xFFFFFFFF
@@ -116,6 +266,14 @@ class DWGBitCodes:
         """
         value = 0
         length = self.read_3b()
+        if length == 0:
+            return value
+
+        value = self.read_bits(length << 3)
+        if value is not None:
+            return value & 0xFFFFFFFFFFFFFFFF
+
+        value = 0
         for idx in range(length):
             byte = self.read_rc()
             value = ((value << 8) | byte)
@@ -135,7 +293,7 @@ class DWGBitCodes:
             value = float(0.0)
         elif what_it_is == 0x03:
             msg = "'11' is not used."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return float(0.0)
 
         return value
@@ -148,20 +306,30 @@ class DWGBitCodes:
     def read_rc(self):
         """Read a raw char
         """
-        if self.pos_byte >= self.size:
+        pos = self.pos
+        if 0 <= pos and pos + 8 <= self.fast_end:
+            self.pos = pos + 8
+            idx = pos >> 3
+            shift = pos & 0x07
+            if shift == 0:
+                return self._buf[idx]
+            return ((self._buf[idx] << shift) | (self._buf[idx+1] >> (8 - shift))) & 0xFF
+
+        pos_byte, pos_bit = pos >> 3, pos & 0x07
+        if pos_byte >= self._size:
             msg = "No more data."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
-        byte = self.buf[self.pos_byte]
+        byte = self._buf[pos_byte]
 
-        if self.pos_bit == 0:
+        if pos_bit == 0:
             value = byte
         else:
-            value = byte << self.pos_bit
-            if self.pos_byte < self.size - 1:
-                byte = self.buf[self.pos_byte + 1]
-                value |= (byte >> (8 - self.pos_bit))
+            value = byte << pos_bit
+            if pos_byte < self._size - 1:
+                byte = self._buf[pos_byte + 1]
+                value |= (byte >> (8 - pos_bit))
 
         self.update_status(8)
         return value & 0xFF
@@ -174,14 +342,18 @@ class DWGBitCodes:
         if count <= 0:
             return chars
 
-        if self.pos_bit == 0:
-            if self.size >= self.pos_byte+count:
-                chars.extend(self.buf[self.pos_byte:self.pos_byte+count])
-                self.pos_byte += count
+        if self.pos & 0x07 == 0:
+            pos_byte = self.pos >> 3
+            if self._size >= pos_byte+count:
+                self.pos += count << 3
+                return bytes(self._buf[pos_byte:pos_byte+count])
             else:
-                chars.extend(self.buf[self.pos_byte:self.size])
-                self.pos_byte = self.size
+                self.pos = self._size << 3
+                return bytes(self._buf[pos_byte:self._size])
         else:
+            data = self.read_run(count)
+            if data is not None:
+                return data
             for idx in range(count):
                 chars.append(self.read_rc())
         return bytes(chars)
@@ -189,6 +361,16 @@ class DWGBitCodes:
     def read_rs(self, endian='little'):
         """Read a raw short
         """
+        values = self.unpack_aligned(STRUCT_RS[endian])
+        if values is not None:
+            return values[0]
+
+        value = self.read_bits(16)
+        if value is not None:
+            if endian == 'little':
+                return ((value & 0xFF) << 8) | (value >> 8)
+            return value
+
         byte1 = self.read_rc()
         byte2 = self.read_rc()
 
@@ -205,6 +387,19 @@ class DWGBitCodes:
     def read_rl(self, endian='little'):
         """Read a raw long (2 shorts) (not compressed)
         """
+        values = self.unpack_aligned(STRUCT_RL[endian])
+        if values is not None:
+            if endian == 'little':
+                return values[0]
+            return (values[1] << 16) | values[0]
+
+        value = self.read_bits(32)
+        if value is not None:
+            if endian == 'little':
+                return int.from_bytes(value.to_bytes(4, 'big'), 'little')
+            # 2 big-endian shorts, the first one is the low word
+            return ((value & 0xFFFF) << 16) | (value >> 16)
+
         short1 = self.read_rs(endian)
         short2 = self.read_rs(endian)
 
@@ -218,9 +413,17 @@ class DWGBitCodes:
     def read_rd(self, endian='little'):
         """Read a raw double (8 bytes) (not compressed)
         """
-        data = bytearray()
-        for idx in range(8):
-            data.append(self.read_rc())
+        values = self.unpack_aligned(STRUCT_RD[endian])
+        if values is not None:
+            return values[0]
+
+        value = self.read_bits(64)
+        if value is not None:
+            data = value.to_bytes(8, 'big')
+        else:
+            data = bytearray()
+            for idx in range(8):
+                data.append(self.read_rc())
 
         if endian == 'little':
             value = struct.unpack('<d', data)[0]
@@ -231,11 +434,17 @@ class DWGBitCodes:
     def read_2rd(self, endian='little'):
         """Read 2 raw doubles
         """
+        values = self.unpack_aligned(STRUCT_2RD[endian])
+        if values is not None:
+            return values
         return self.read_rd(endian), self.read_rd(endian)
 
     def read_3rd(self, endian='little'):
         """Read 3 raw doubles
         """
+        values = self.unpack_aligned(STRUCT_3RD[endian])
+        if values is not None:
+            return values
         return self.read_rd(endian), self.read_rd(endian), self.read_rd(endian)
 
     def read_mc(self):
@@ -288,22 +497,28 @@ class DWGBitCodes:
 
     def read_h(self):
         """Read a handle reference
-        """
-        handle = OrderedDict()
 
-        handle['code'] = self.read_rc()
-        handle['counter'] = handle['code'] & 0x0F
-        handle['code'] = ((handle['code'] & 0xF0) >> 4)
-        handle['value'] = 0
+        Returns:
+            DWGHandle (code, counter, value) or None
+        """
+        code = self.read_rc()
+        handle = DWGHandle((code & 0xF0) >> 4, code & 0x0F)
 
-        if handle['counter'] > 4:
-            msg = "Invalid handle counter {} is detected.".format(handle['counter'])
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+        if handle.counter > 4:
+            self.logger.debug("Invalid handle counter %d is detected.", handle.counter)
             return None
 
-        for idx in range(handle['counter']-1, -1, -1):
+        if handle.counter == 0:
+            return handle
+
+        value = self.read_bits(handle.counter << 3)
+        if value is not None:
+            handle.value = value
+            return handle
+
+        for idx in range(handle.counter-1, -1, -1):
             value = self.read_rc()
-            handle['value'] = (handle['value'] | (value << idx*8))
+            handle.value = (handle.value | (value << idx*8))
 
         return handle
 
@@ -313,6 +528,11 @@ class DWGBitCodes:
         """
         text = bytearray()
         length = self.read_bs()
+
+        data = self.read_run(length << 1)
+        if data is not None:
+            return data.decode("utf-16LE", "ignore")
+
         for idx in range(length):
             unicode = self.read_rs()
             text += unicode.to_bytes(2, 'little')
@@ -324,21 +544,31 @@ class DWGBitCodes:
             TODO 1: non-ASCII character
             TODO 2: {font; }, \P
         """
-        text = b""
+        text = bytearray()
         length = self.read_bs()
+
+        data = self.read_run(length)
+        if data is not None:
+            text = data.translate(TV_CHAR_TABLE, b"\x00")
+            return text.decode("utf-8", "ignore")
+
         for idx in range(length):
             char = self.read_rc()
             if char == 0x00:
                 continue
             elif char >= 0x7F:
                 char = 0x2A
-            text += char.to_bytes(1, 'little')
+            text.append(char)
         text = text.decode("utf-8", "ignore")
         return text
 
     def read_sn(self):
         """Read a sentinel (16 bytes)
         """
+        value = self.read_bits(128)
+        if value is not None:
+            return list(value.to_bytes(16, 'big'))
+
         sn = []
         for idx in range(16):
             sn.append(self.read_rc())
@@ -424,38 +654,37 @@ class DWGBitCodes:
 
     def update_status(self, plus_bit):
         """Update the current 'bit' and 'byte' position info.
+
+            The cursor does not move across the last byte (it stops at the last bit).
         """
-        pos_end = self.pos_bit + plus_bit
-        if self.pos_byte >= self.size - 1 and pos_end > 7:
-            self.pos_bit = 7
+        pos_byte, pos_bit = self.pos >> 3, self.pos & 0x07
+        pos_end = pos_bit + plus_bit
+        if pos_byte >= self._size - 1 and pos_end > 7:
+            self.pos = (pos_byte << 3) | 7
             return
-        self.pos_byte += int(pos_end / 8)
-        self.pos_bit   = int(pos_end % 8)
+        self.pos += plus_bit
         return
 
     def set_pos(self, pos_byte, pos_bit=0):
         """Set the current position info.
         """
-        self.pos_byte = pos_byte
-        self.pos_bit  = pos_bit
+        self.pos = (pos_byte << 3) + pos_bit
         return
 
     def plus_pos(self, pos_byte, pos_bit=0):
         """Plus the position info.
         """
-        self.pos_byte += pos_byte
-        self.pos_bit  += pos_bit
+        self.pos += (pos_byte << 3) + pos_bit
         return
 
     def set_bit_pos(self, pos_bit):
         """Set the current position info. using bit value
         """
-        pos_byte_new, pos_bit_new = divmod(pos_bit, 8)
-        self.set_pos(pos_byte_new, pos_bit_new)
+        self.pos = pos_bit
         return
 
     def get_pos(self):
         """Get the current position info.
         """
-        return self.pos_byte, self.pos_bit
+        return self.pos >> 3, self.pos & 0x07
 
@@ -18,9 +18,13 @@ PYDWG_VERSION = '0.3'
 
 
 from ctypes import *
+from ctypes import _SimpleCData
 from enum import Enum, IntEnum
-import inspect
-GET_MY_NAME = lambda: inspect.stack()[1][3]
+from collections import OrderedDict
+import struct
+import sys
+# logging calls no longer use it; log records carry the function name (%(funcName)s)
+GET_MY_NAME = lambda: sys._getframe(1).f_code.co_name
 
 def RELEASE_LIST(a):
    del a[:]
@@ -34,6 +38,16 @@ class DWGParsingMode(IntEnum):
     FULL = 2
 
 
+class DWGLoadingMode(IntEnum):
+    """DWGLoadingMode class
+
+        How the file data is handed to the format modules
+    """
+    MEMORY = 0  # read the whole file into a bytes object
+    MMAP = 1    # memory-map the file and share it as a memoryview (zero-copy)
+    STREAM = 2  # keep the file open and read only the requested byte ranges
+
+
 class DWGVersion(IntEnum):
     """DWGVersion class
 
@@ -475,3 +489,98 @@ class DWG_R21_SECTION_ENTRY_PAGE_INFO(LittleEndianStructure):
     ]
     _pack_ = 8
 
+
+
+"""
+Precompiled unpackers for the structures above
+"""
+
+class DWGStructUnpacker:
+    """DWGStructUnpacker class
+
+        Unpacks a ctypes structure definition with one precompiled struct.Struct
+        (field offsets and padding are taken from the ctypes layout).
+        Values are the same as DWGUtils.get_dict_from_ctypes_struct() returns:
+        byte arrays become lists, and char arrays become strings (None if empty).
+    """
+
+    def __init__(self, structure):
+        """The constructor
+
+        Args:
+            structure (ctypes structure class)
+        """
+        self.structure = structure
+        self.size = sizeof(structure)
+        self.names = []
+        self.converters = []   # (field name, function)
+
+        fmt = "<"
+        pos = 0
+        for name, ctype in structure._fields_:
+            field = getattr(structure, name)
+            if pos < field.offset:
+                fmt += "{}x".format(field.offset - pos)
+
+            if issubclass(ctype, Array) and ctype._type_ in (c_char, c_ubyte):
+                fmt += "{}s".format(ctype._length_)
+                if ctype._type_ is c_char:
+                    self.converters.append((name, DWGStructUnpacker.to_string))
+                else:
+                    self.converters.append((name, list))
+            elif issubclass(ctype, _SimpleCData) and ctype._type_ in "bBhHiIlLqQ":
+                code = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}[field.size]
+                fmt += code.upper() if ctype._type_.isupper() else code
+            else:
+                raise TypeError("Unsupported field type: {}.{}".format(structure.__name__, name))
+
+            self.names.append(name)
+            pos = field.offset + field.size
+
+        if pos < self.size:
+            fmt += "{}x".format(self.size - pos)
+
+        self.struct = struct.Struct(fmt)
+        return
+
+    @staticmethod
+    def to_string(value):
+        # like c_char arrays: the value ends at the first null character
+        value = value.split(b"\x00", 1)[0]
+        return value.decode("utf-8") if value else None
+
+    def unpack(self, buffer, offset=0):
+        """Unpack a structure
+
+        Args:
+            buffer (bytes, bytearray or memoryview)
+            offset (int): The start offset in buffer
+
+        Returns:
+            Unpacked structure (OrderedDict); a short buffer is padded with zeros
+        """
+        if len(buffer) - offset < self.size:
+            buffer = bytes(buffer[offset:]) + bytes(self.size - max(len(buffer) - offset, 0))
+            offset = 0
+
+        record = OrderedDict(zip(self.names, self.struct.unpack_from(buffer, offset)))
+        for name, converter in self.converters:
+            record[name] = converter(record[name])
+        return record
+
+
+DWG_STRUCT_UNPACKERS = {structure: DWGStructUnpacker(structure) for structure in (
+    DWG_R18_FILE_HEADER_1ST,
+    DWG_R18_FILE_HEADER_2ND,
+    DWG_R18_SYSTEM_SECTION_HEADER,
+    DWG_R18_SECTION_MAP_HEADER,
+    DWG_R18_SECTION_ENTRY,
+    DWG_R18_SECTION_ENTRY_PAGE_INFO,
+    DWG_R18_DATA_SECTION_HEADER,
+    DWG_R21_FILE_HEADER_1ST,
+    DWG_R21_FILE_HEADER_2ND_HEAD,
+    DWG_R21_FILE_HEADER_2ND_BODY,
+    DWG_R21_FILE_HEADER_2ND_TAIL,
+    DWG_R21_SECTION_ENTRY,
+    DWG_R21_SECTION_ENTRY_PAGE_INFO
+)}
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGFileBuffer - read-only buffer view over a seekable file-like object
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+import io
+import logging
+from .dwg_common import *
+
+
+class DWGFileBuffer:
+    """DWGFileBuffer class
+
+        Behaves like a read-only bytes object for the format modules (len() and slicing),
+        but every access is served by seeking and reading only the requested byte range.
+    """
+
+    def __init__(self, fp, offset=None, size=None):
+        """The constructor
+
+        Args:
+            fp (file-like object): A seekable binary stream
+            offset (int): The start of DWG data in the stream (default: the current position)
+            size (int): The length of DWG data (default: up to the end of the stream)
+        """
+        self.fp = fp
+        self.offset = fp.tell() if offset is None else offset
+
+        if size is None:
+            size = fp.seek(0, io.SEEK_END) - self.offset
+        self.size = max(size, 0)
+
+        # I/O statistics
+        self.read_count = 0
+        self.read_bytes = 0
+
+        # global logger
+        self.logger = logging.getLogger(__name__)
+        return
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        """Read a byte (int) or a byte range (bytes) from the stream
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.size)
+            if step != 1:
+                # read the covering range once, then pick every step-th byte of it
+                rows = range(start, stop, step)
+                if len(rows) == 0:
+                    return b""
+                low = min(rows[0], rows[-1])
+                data = self.read(low, abs(rows[-1] - rows[0]) + 1)
+                return data[rows[0] - low::step]
+            return self.read(start, stop - start)
+
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("DWGFileBuffer index out of range")
+        return self.read(key, 1)[0]
+
+    def read(self, offset, length):
+        """Read data at the offset
+
+        Args:
+            offset (int): The offset from beginning of DWG data
+            length (int): The length to read
+
+        Returns:
+            Data (bytes)
+        """
+        if length <= 0 or offset >= self.size:
+            return b""
+
+        length = min(length, self.size - offset)
+        self.fp.seek(self.offset + offset)
+        data = self.fp.read(length)
+
+        self.read_count += 1
+        self.read_bytes += len(data)
+        return data
+
+    def close(self):
+        """Drop the reference to the stream (the caller owns and closes it)
+        """
+        self.fp = None
+        return
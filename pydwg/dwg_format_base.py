@@ -16,15 +16,80 @@
 """
 from .dwg_common import *
 from .dwg_report import *
+from .dwg_page_map import DWGPageMap
+
+
+class DWGLazySection(object):
+    """DWGLazySection class
+
+        A data section attribute decoded on first read (by the loader method of the format module)
+        and cached in the instance. Before the section map is parsed, reads return None without caching.
+        Assigning sets the cached value; deleting it makes the next read decode the section again.
+    """
+
+    def __init__(self, name, loader):
+        """The constructor
+
+        Args:
+            name (str): The attribute name
+            loader (str): The name of the loader method
+        """
+        self.name = name
+        self.loader = loader
+        return
+
+    def __get__(self, fm, owner=None):
+        if fm is None:
+            return self
+
+        try:
+            return fm.__dict__[self.name]
+        except KeyError:
+            pass
+
+        if fm.dwg_section_map is None:
+            return None
+
+        fm.__dict__[self.name] = None   # a section read while it is loading is None
+        try:
+            fm.__dict__[self.name] = getattr(fm, self.loader)()
+        except BaseException:
+            del fm.__dict__[self.name]
+            raise
+        return fm.__dict__[self.name]
+
+    def __set__(self, fm, value):
+        fm.__dict__[self.name] = value
+
+    def __delete__(self, fm):
+        fm.__dict__.pop(self.name, None)
 
 
 class DWGFormatBase(object):
     """DWGFormatBase class
     """
 
+    # Data sections (ds), decoded on first read
+    dwg_security = DWGLazySection('dwg_security', 'load_security')                  # security info. (dict)
+    dwg_summaryinfo = DWGLazySection('dwg_summaryinfo', 'load_summaryinfo')         # document properties (dict)
+    dwg_appinfo = DWGLazySection('dwg_appinfo', 'load_appinfo')                     # application info. (dict)
+    dwg_appinfohistory = DWGLazySection('dwg_appinfohistory', 'load_appinfohistory')  # application info. history (dict)
+    dwg_auxheader = DWGLazySection('dwg_auxheader', 'load_auxheader')               # additional document properties (dict)
+    dwg_preview = DWGLazySection('dwg_preview', 'load_preview')                     # preview data (dict)
+    dwg_header = DWGLazySection('dwg_header', 'load_header')                        # header (system) variables (dict)
+    dwg_filedeplist = DWGLazySection('dwg_filedeplist', 'load_filedeplist')         # file dependencies (dict)
+    dwg_classes = DWGLazySection('dwg_classes', 'load_classes')                     # defined classes (dict)
+    dwg_object_map = DWGLazySection('dwg_object_map', 'load_object_map')            # list of handle/object location(offset) pairs
+
+    DATA_SECTIONS = ('dwg_security', 'dwg_summaryinfo', 'dwg_appinfo', 'dwg_appinfohistory', 'dwg_auxheader',
+                     'dwg_preview', 'dwg_header', 'dwg_filedeplist', 'dwg_classes', 'dwg_object_map')
+
     def __init__(self):
         """The constructor"""
         self.mode = DWGParsingMode.FULL
+        self.rs_correction = False          # correct R21 pages using Reed-Solomon parity bytes
+        self.page_cache = None              # DWGPageCache of decompressed data pages (None: no caching)
+        self.page_cache_namespace = None    # tells this file apart in a shared page cache
 
         # File header & System sections (ss)
         self.dwg_file_header_1st = None
@@ -33,24 +98,276 @@ class DWGFormatBase(object):
         self.dwg_section_map = None         # for just data sections
         self.dwg_section_entry_list = []    # list of section entry
 
-        # Data sections (ds)
-        self.dwg_summaryinfo = None         # document properties (dict)
-        self.dwg_appinfo = None             # application info. (dict)
-        self.dwg_appinfohistory = None      # application info. history (dict)
-        self.dwg_filedeplist = None         # file dependencies (dict)
-        self.dwg_preview = None             # preview data (dict)
-        self.dwg_security = None            # security info. (dict)
-        self.dwg_header = None              # header (system) variables (dict)
-        self.dwg_classes = None             # defined classes (dict)
-        self.dwg_auxheader = None           # additional document properties (dict)
-
-        self.dwg_object_map = None          # list of handle/object location(offset) pairs
+        # Lookup indexes of system sections (built once the maps are parsed)
+        self.dwg_page_index = {}            # page id -> page map entry (dict or DWGPageIndex)
+        self.dwg_section_index = {}         # section name -> section map entry
+        self.dwg_section_hash_index = {}    # section hash code -> section map entry (R21)
+
+        # Data sections (ds): see DATA_SECTIONS (decoded on first read)
         self.dwg_objects = None             # list of decoded objects
+        self.dwg_object_index = None        # handle -> offset in AcDb:AcDbObjects (built on the first lookup)
+        self.dwg_object_section = None      # AcDb:AcDbObjects section (paged view kept for handle lookups)
+
+        # File data (bytes, memoryview or DWGFileBuffer)
+        self.file_buf = None
+        self.file_size = 0
 
         # Report
         self.report = DWGReport()
         return
 
+    def read_page(self, address, size):
+        """Read the byte range of a page
+
+            All page data goes through here, so a DWGFileBuffer-backed module
+            reads just the pages actually requested (one seek & read per page).
+
+        Args:
+            address (int): The start address from the beginning of the file
+            size (int): The page size
+
+        Returns:
+            Page data (bytes or memoryview)
+        """
+        if address < 0 or size <= 0:
+            return b""
+        return self.file_buf[address:address+size]
+
+    def build_page_index(self):
+        """Build the page id -> page map entry index
+
+            The first entry wins when an id appears more than once (as the linear scan did).
+
+        Returns:
+            The number of indexed pages
+        """
+        self.dwg_page_index = {}
+        if self.dwg_page_map is None:
+            return 0
+
+        page_map = self.dwg_page_map.get('map')
+        if isinstance(page_map, DWGPageMap):
+            # entries are built on lookup
+            self.dwg_page_index = page_map.index()
+            return len(self.dwg_page_index)
+
+        for entry in page_map:
+            self.dwg_page_index.setdefault(entry.get('id'), entry)
+        return len(self.dwg_page_index)
+
+    def build_section_index(self):
+        """Build the section name (and hash code) -> section map entry indexes
+
+        Returns:
+            The number of indexed sections
+        """
+        self.dwg_section_index = {}
+        self.dwg_section_hash_index = {}
+        if self.dwg_section_map is None:
+            return 0
+
+        for entry in self.dwg_section_map.get('map'):
+            self.dwg_section_index.setdefault(entry.get('name'), entry)
+            if entry.get('hash_code') is not None:
+                self.dwg_section_hash_index.setdefault(entry.get('hash_code'), entry)
+        return len(self.dwg_section_index)
+
+    def find_page_entry(self, id):
+        """Find a page map entry by page id
+
+        Returns:
+            Page map entry (dict) or None
+        """
+        return self.dwg_page_index.get(id)
+
+    def find_section_entry(self, name):
+        """Find a section map entry by section name
+
+        Args:
+            name (str or DWGSectionName): The section name
+
+        Returns:
+            Section map entry (dict) or None
+        """
+        if isinstance(name, DWGSectionName):
+            name = name.value
+        return self.dwg_section_index.get(name)
+
+    def load_data_sections(self):
+        """Decode all data sections not read yet (see DATA_SECTIONS)
+        """
+        for name in self.DATA_SECTIONS:
+            getattr(self, name)
+        return
+
+    def load_security(self):
+        return None
+
+    def load_summaryinfo(self):
+        return None
+
+    def load_appinfo(self):
+        return None
+
+    def load_appinfohistory(self):
+        return None
+
+    def load_auxheader(self):
+        return None
+
+    def load_preview(self):
+        return None
+
+    def load_header(self):
+        return None
+
+    def load_filedeplist(self):
+        return None
+
+    def load_classes(self):
+        return None
+
+    def load_object_map(self):
+        return None
+
+    def get_cached_page(self, page_id):
+        """Get a decompressed data page from the page cache
+
+            Findings reported while the page was read (abnormal header, decompression,
+            RS correction) are added to this report again, so a parser sharing the cache
+            reports the same as one reading the page itself.
+
+        Args:
+            page_id (int): The page id in the page map
+
+        Returns:
+            Cached page or None
+        """
+        if self.page_cache is None:
+            return None
+
+        item = self.page_cache.get((self.page_cache_namespace, page_id))
+        if item is None:
+            return None
+
+        page, findings = item
+        for vinfo in findings:
+            self.report.add(vinfo)
+        return page
+
+    def put_cached_page(self, page_id, page, size, report_mark=None):
+        """Add a decompressed data page to the page cache
+
+        Args:
+            page_id (int): The page id in the page map
+            page: The page to keep (format specific, not modified afterwards)
+            size (int): The size counted against the cache budget (data + header bytes)
+            report_mark (int): len(self.report.vinfo) before the page was read
+                               (findings from there on are kept with the page)
+        """
+        if self.page_cache is not None:
+            findings = tuple(self.report.vinfo[report_mark:]) if report_mark is not None else ()
+            self.page_cache.put((self.page_cache_namespace, page_id), (page, findings), size)
+        return
+
+    def read_object_section(self):
+        """Read the AcDb:AcDbObjects section (implemented by format modules)
+
+        Returns:
+            Section data (dict) or None
+        """
+        return None
+
+    def get_object_section(self):
+        """Get the AcDb:AcDbObjects section (read once and kept)
+
+            The data is a paged view (DWGSectionPages): only the pages covering
+            decoded objects are decompressed.
+
+        Returns:
+            Section data (dict) or None
+        """
+        if self.dwg_object_section is None:
+            self.dwg_object_section = self.read_object_section()
+        return self.dwg_object_section
+
+    def build_object_index(self):
+        """Build the handle -> offset index of the object map
+
+            The first entry wins when a handle appears more than once.
+
+        Returns:
+            The number of indexed handles
+        """
+        self.dwg_object_index = {}
+        if self.dwg_object_map is None:
+            return 0
+
+        for item in self.dwg_object_map:
+            self.dwg_object_index.setdefault(item.get('handle'), item.get('offset'))
+        return len(self.dwg_object_index)
+
+    def get_object(self, handle, check_crc=True):
+        """Decode the object of a handle (just that object)
+
+        Args:
+            handle (int): The handle value
+            check_crc (bool): Verify the CRC of the object
+
+        Returns:
+            Decoded object (DWGObjectEntry) or None
+        """
+        for obj in self.iter_objects(handles=[handle], check_crc=check_crc):
+            return obj
+        return None
+
+    def iter_objects(self, handles=None, check_crc=True, types=None):
+        """Decode objects one by one (without building dwg_objects)
+
+            Parse in METADATA mode and iterate to stream objects in constant memory.
+
+        Args:
+            handles (iterable): Handle values to decode (default: all objects in object map order)
+            check_crc (bool): Verify the CRC of each object
+            types (iterable): Object types to decode (type codes, names or DWGObjectType), None for all;
+                              other objects are skipped after reading just their size and type
+
+        Yields:
+            Decoded object (DWGObjectEntry); unknown handles and undecodable objects are skipped
+        """
+        if self.dwg_object_map is None:
+            return
+
+        # custom classes (type >= 500) come from AcDb:Classes
+        if self.dwg_classes is None:
+            self.logger.debug("No custom classes.")
+
+        section = self.get_object_section()
+        if section is None or len(section.get('data')) == 0:
+            return
+
+        if handles is None:
+            # stream all objects (nothing is kept after yielding)
+            for obj in self.decoder.iter_objects(section, self.dwg_object_map, check_crc, types):
+                yield obj
+            return
+
+        if self.dwg_object_index is None:
+            self.build_object_index()
+
+        type_codes = self.decoder.object.get_type_codes(types) if types is not None else None
+
+        data = section.get('data')
+        for handle in handles:
+            offset = self.dwg_object_index.get(handle)
+            if offset is None:
+                self.logger.info("[object map] Do not exist the handle %s.", handle)
+                continue
+
+            obj = self.decoder.object_at(data, handle, offset, check_crc, type_codes)
+            if obj is not None:
+                yield obj
+
     def close(self):
         # File header & System sections (ss)
         self.dwg_file_header_1st = None
@@ -58,6 +375,9 @@ class DWGFormatBase(object):
         self.dwg_page_map = None
         self.dwg_section_map = None
         self.dwg_section_entry_list = None
+        self.dwg_page_index = {}
+        self.dwg_section_index = {}
+        self.dwg_section_hash_index = {}
 
         # Data sections (ds)
         self.dwg_summaryinfo = None
@@ -72,4 +392,9 @@ class DWGFormatBase(object):
 
         self.dwg_object_map = None
         self.dwg_objects = None
+        self.dwg_object_index = None
+        self.dwg_object_section = None
+
+        # drop the reference to the (possibly memory-mapped) file buffer
+        self.file_buf = None
         return
@@ -16,12 +16,15 @@
 """
 
 import ctypes
+from types import MappingProxyType
 from .dwg_common import *
 from .dwg_utils import *
 from .dwg_bit_codes import *
 from .dwg_report import *
 from .dwg_section_decoder import *
 from .dwg_format_base import DWGFormatBase
+from .dwg_page_map import DWGPageMap
+from .dwg_section_pages import DWGSectionPages
 
 
 class DWGFormatR18(DWGFormatBase):
@@ -54,7 +57,7 @@ class DWGFormatR18(DWGFormatBase):
         self.dwg_file_header_2nd = self.get_file_header(offset)
         if self.dwg_file_header_2nd.get('body') is None:
             msg = "2nd file header is invalid."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, -1, -1, msg))
             return False
 
@@ -67,23 +70,28 @@ class DWGFormatR18(DWGFormatBase):
         offset = self.dwg_file_header_2nd.get('body').get('page_map_address')
         offset += 0x100  # skip the file header
         self.dwg_page_map = self.get_page_map(offset)
+        self.build_page_index()
 
         # section map (= directory entries for data sections)
         id = self.dwg_file_header_2nd.get('body').get('section_map_id')
         page_entry = self.find_page_entry(id)
         if page_entry is None:
             msg = "Cannot find the section map."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, -1, -1, msg))
             return False
 
         address = page_entry.get('address')
         self.dwg_section_map = self.get_section_map(address)
+        self.build_section_index()
         # return False
 
         # build section entry list
         # if self.build_section_entry_list() == 0:
         #     return False
+        if self.mode == DWGParsingMode.VALIDATION and self.dwg_section_map is not None:
+            # verify checksums of all data pages
+            self.build_section_entry_list()
 
         # for debugging
         # self.save_section_data()
@@ -107,79 +115,129 @@ class DWGFormatR18(DWGFormatBase):
         =============================================================
         '''
         '''-------------------------------------------------------'''
-        security_flags = self.dwg_file_header_1st.get('body').get('security_flags')
-        if security_flags > 0:
-            section = self.get_section_data_by_name(DWGSectionName.SECURITY)
-            if section is not None:
-                self.dwg_filedeplist = self.decoder.security(section)
+        if self.mode == DWGParsingMode.METADATA:
+            # data sections are decoded when their attributes are first read
+            return True
+
+        self.load_data_sections()
 
         '''-------------------------------------------------------'''
-        section = self.get_section_data_by_name(DWGSectionName.SUMMARYINFO)
+        if self.mode == DWGParsingMode.VALIDATION:
+            return True
+
+        '''-------------------------------------------------------'''
+        # Get all objects with object map from AcDb:AcDbObjects
+        section = self.get_object_section()
         if section is not None:
-            self.dwg_summaryinfo = self.decoder.summaryinfo(section, encoding=DWGEncoding.KOREAN.value)
+            self.dwg_objects = self.decoder.objects(section, self.dwg_object_map)
+
+        # get all objects by carving
+        # unfortunately, there is little chance to have unused area in AcDbObjects data stream
 
         '''-------------------------------------------------------'''
-        app_version = self.dwg_file_header_1st.get('body').get('app_version')
+        # post-process
+        # self.check_parsed_results()
+        return True
+
+    def load_security(self):
+        """Decode AcDb:Security (encryption settings)
+        """
+        security_flags = self.dwg_file_header_1st.get('body').get('security_flags')
+        if security_flags <= 0:
+            return None
 
+        section = self.get_section_data_by_name(DWGSectionName.SECURITY)
+        if section is None:
+            return None
+        return self.decoder.security(section)
+
+    def load_summaryinfo(self):
+        """Decode AcDb:SummaryInfo (document properties)
+        """
+        section = self.get_section_data_by_name(DWGSectionName.SUMMARYINFO)
+        if section is None:
+            return None
+        return self.decoder.summaryinfo(section, encoding=DWGEncoding.KOREAN.value)
+
+    def load_appinfo(self):
+        """Decode AcDb:AppInfo (application info.)
+        """
         section = self.get_section_data_by_name(DWGSectionName.APPINFO)
-        if section is not None:
-            self.dwg_appinfo = self.decoder.appinfo(section, app_version)
+        if section is None:
+            return None
+        return self.decoder.appinfo(section, self.dwg_file_header_1st.get('body').get('app_version'))
 
+    def load_appinfohistory(self):
+        """Decode AcDb:AppInfoHistory (application info.)
+        """
         section = self.get_section_data_by_name(DWGSectionName.APPINFOHISTORY)
-        if section is not None:
-            self.dwg_appinfohistory = self.decoder.appinfohistory(section, app_version)
+        if section is None:
+            return None
+        return self.decoder.appinfohistory(section, self.dwg_file_header_1st.get('body').get('app_version'))
 
-        '''-------------------------------------------------------'''
+    def load_auxheader(self):
+        """Decode AcDb:AuxHeader (document properties, additional)
+        """
         section = self.get_section_data_by_name(DWGSectionName.AUXHEADER)
-        if section is not None:
-            self.dwg_auxheader = self.decoder.auxheader(section)
+        if section is None:
+            return None
+        return self.decoder.auxheader(section)
 
-        '''-------------------------------------------------------'''
+    def load_preview(self):
+        """Decode AcDb:Preview (preview images)
+        """
         section = self.get_section_data_by_name(DWGSectionName.PREVIEW)
-        if section is not None:
-            self.dwg_preview = self.decoder.preview(section)
+        if section is None:
+            return None
+        return self.decoder.preview(section)
 
-        '''-------------------------------------------------------'''
+    def load_header(self):
+        """Decode AcDb:Header (header variables, base handle values)
+        """
         section = self.get_section_data_by_name(DWGSectionName.HEADER)
-        if section is not None:
-            self.dwg_header = self.decoder.header(section)
+        if section is None:
+            return None
+        return self.decoder.header(section)
 
-        '''-------------------------------------------------------'''
+    def load_filedeplist(self):
+        """Decode AcDb:FileDepList (file dependencies)
+        """
         section = self.get_section_data_by_name(DWGSectionName.FILEDEPLIST)
-        if section is not None:
-            self.dwg_filedeplist = self.decoder.filedeplist(section)
+        if section is None:
+            return None
+        return self.decoder.filedeplist(section)
 
-        '''-------------------------------------------------------'''
-        # Get defined classes from AcDb:Classes
+    def load_classes(self):
+        """Decode AcDb:Classes (custom classes) and pass them to the object decoder
+        """
         section = self.get_section_data_by_name(DWGSectionName.CLASSES)
-        if section is not None:
-            self.dwg_classes = self.decoder.classes(section)
-            self.decoder.object.set_classes(self.dwg_classes.get('classes'))
+        if section is None:
+            return None
 
-        '''-------------------------------------------------------'''
-        # Build the object map for locating objects using AcDb:Handles
+        classes = self.decoder.classes(section)
+        self.decoder.object.set_classes(classes.get('classes'))
+        return classes
+
+    def load_object_map(self):
+        """Build the object map for locating objects using AcDb:Handles
+        """
         section = self.get_section_data_by_name(DWGSectionName.HANDLES)
-        if section is not None:
-            self.dwg_object_map = self.build_object_map(section)
+        if section is None:
+            return None
+        return self.build_object_map(section)
 
-        '''-------------------------------------------------------'''
-        if self.mode == DWGParsingMode.METADATA or \
-           self.mode == DWGParsingMode.VALIDATION:
-            return True
+    def read_object_section(self):
+        """Read the AcDb:AcDbObjects section as a paged view (see DWGSectionPages)
 
-        '''-------------------------------------------------------'''
-        # Get all objects with object map from AcDb:AcDbObjects
-        section = self.get_section_data_by_name(DWGSectionName.ACDBOBJECTS)
-        if section is not None:
-            self.dwg_objects = self.decoder.objects(section, self.dwg_object_map)
-
-        # get all objects by carving
-        # unfortunately, there is little chance to have unused area in AcDbObjects data stream
+        Returns:
+            Section data (dict) or None
+        """
+        section_meta = self.find_section_entry(DWGSectionName.ACDBOBJECTS)
+        if section_meta is None:
+            self.logger.info("[section map] Do not exist the section '%s'.", DWGSectionName.ACDBOBJECTS.value)
+            return None
 
-        '''-------------------------------------------------------'''
-        # post-process
-        # self.check_parsed_results()
-        return True
+        return self.get_section_pages(section_meta)
 
     def save_section_data(self):
         """Save all section data for debugging
@@ -381,7 +439,7 @@ class DWGFormatR18(DWGFormatBase):
                 if last_offset < 0:
                     msg = "[{}] Found an abnormal address value at {}th entry.".format(
                             DWGSectionName.HANDLES.value, len(object_map))
-                    self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                    self.logger.debug(msg)
                     self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
 
                 object_map.append({'handle': last_handle,
@@ -392,7 +450,7 @@ class DWGFormatR18(DWGFormatBase):
 
         # Validate CRC value
 
-        self.logger.info("{}(): {} items in object map.".format(GET_MY_NAME(), len(object_map)))
+        self.logger.info("%d items in object map.", len(object_map))
         return object_map
 
     def build_section_entry_list(self):
@@ -440,18 +498,15 @@ class DWGFormatR18(DWGFormatBase):
                 header = OrderedDict()
                 header['offset'] = offset_ff
                 header['size'] = sizeof(DWG_R18_DATA_SECTION_HEADER)
-                header['body'] = self.utils.static_cast(temp[0:sizeof(DWG_R18_DATA_SECTION_HEADER)],
-                                                        DWG_R18_DATA_SECTION_HEADER)
-                header['body'] = self.utils.get_dict_from_ctypes_struct(header['body'])
+                header['body'] = self.utils.unpack_struct(temp[0:sizeof(DWG_R18_DATA_SECTION_HEADER)],
+                                                          DWG_R18_DATA_SECTION_HEADER)
                 headers.append(header)
 
                 # Check the data checksum
                 offset_ff = offset_ff + header.get('size')
                 data = self.file_buf[offset_ff:offset_ff+header.get('body').get('compressed_size')]
 
-                v = self.verify_checksum(data, 0, header.get('body').get('data_checksum'))
-                # if v is False:
-                #     print("[ALERT] Abnormal point - DWG_R18_DATA_SECTION_HEADER - Checksum check failed")
+                self.verify_data_page_checksum(header, temp, data, section_name)
 
             entry = OrderedDict()
             entry['name'] = section_name
@@ -474,15 +529,10 @@ class DWGFormatR18(DWGFormatBase):
                 data   : decompressed data stream
             }
         """
-        section_meta = None
-        for item in self.dwg_section_map.get('map'):
-            if item.get('name') == s_name.value:
-                section_meta = item
-                break
+        section_meta = self.find_section_entry(s_name)
 
         if section_meta is None:
-            msg = "[{}] Do not exist the section '{}'.".format("section map", s_name.value)
-            self.logger.info("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.info("[section map] Do not exist the section '%s'.", s_name.value)
             return None
 
         return self.get_section_data(section_meta)
@@ -500,15 +550,11 @@ class DWGFormatR18(DWGFormatBase):
                 data   : decompressed data stream
             }
         """
-        self.logger.info("{}(): Get data of the section {}.".format(
-                GET_MY_NAME(),
-                section_meta.get('name'))
-        )
+        self.logger.info("Get data of the section %s.", section_meta.get('name'))
 
         # 0 (if not encrypted), 2 (meaning unknown)
         if section_meta.get('encrypted') == 1:
-            msg = "[{}] Data is encrypted.".format(section_meta.get('name'))
-            self.logger.info("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.info("[%s] Data is encrypted.", section_meta.get('name'))
             return None
 
         max_decompressed_size = section_meta.get('max_decompressed_size')
@@ -518,62 +564,165 @@ class DWGFormatR18(DWGFormatBase):
         data = bytearray(total_decompressed_size)
 
         for idx in range(section_meta.get('page_count')):
-            section_page_entry = self.find_page_entry(section_meta.get('pages')[idx].get('id'))
-            if section_page_entry is None:
+            header = self.get_section_page(section_meta, idx, data, idx*max_decompressed_size)
+            if header is None:
                 continue
-
-            # offset from file header
-            offset_ff = section_page_entry.get('address')
-
-            # decrypt encrypted header data
-            temp = self.file_buf[offset_ff:offset_ff+sizeof(DWG_R18_DATA_SECTION_HEADER)]
-            temp = bytearray(temp)
-            sec_mask = 0x4164536B ^ offset_ff
-            for i in range(0, 32, 4):
-                byte4 = int.from_bytes(temp[i:i+4], byteorder='little')
-                byte4 ^= sec_mask
-                temp[i:i+4] = byte4.to_bytes(4, byteorder='little')
-            temp = bytes(temp)
-
-            header = dict()
-            header['offset'] = offset_ff
-            header['size'] = sizeof(DWG_R18_DATA_SECTION_HEADER)
-            header['body'] = self.utils.static_cast(temp[0:sizeof(DWG_R18_DATA_SECTION_HEADER)],
-                                                    DWG_R18_DATA_SECTION_HEADER)
-            header['body'] = self.utils.get_dict_from_ctypes_struct(header['body'])
-
-            # Validate DWG_R18_DATA_SECTION_HEADER
-            if self.validate_DWG_R18_DATA_SECTION_HEADER(header['body'], header['offset'], header['size']) is False:
-                msg = "Abnormal 'DWG_R18_DATA_SECTION_HEADER' structure."
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            if header is False:
                 return None
-
             headers.append(header)
 
-            # get data stream (if compressed, decompress data)
-            offset = offset_ff + header['size']
-            temp = self.file_buf[offset:offset+header['body'].get('compressed_size')]
-
-            if section_meta.get('compressed') == 2:
-                temp = self.utils.decompress_r18(
-                    temp, len(temp),
-                    max_decompressed_size
-                )
-
-            offset = idx*max_decompressed_size
-            data[offset:offset+len(temp)] = temp
-
         if len(data) != total_decompressed_size:
-            self.logger.debug("{}(): decompressed_size mis-matches.".format(GET_MY_NAME()))
+            self.logger.debug("decompressed_size mis-matches.")
             msg = "[{}] decompressed_size mis-matches.".format(section_meta.get('name'))
             self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
 
-        msg = "Totally {} bytes.".format(len(data))
-        self.logger.info("{}(): {}".format(GET_MY_NAME(), msg))
+        self.logger.info("Totally %d bytes.", len(data))
 
         return {'headers': headers,
                 'data':    bytes(data)}
 
+    def get_section_pages(self, section_meta):
+        """Get a section data as a paged view (pages are decompressed on demand)
+
+            Page headers are read with their pages, so they are not collected,
+            and an abnormal page reads as zero bytes instead of failing the whole section.
+
+        Args:
+            section_meta (dict): A section meta stored in the section map
+
+        Returns:
+            Section data (dict) or None
+            {
+                headers: None
+                data   : decompressed data stream (DWGSectionPages)
+            }
+        """
+        self.logger.info("Get paged data of the section %s.", section_meta.get('name'))
+
+        if section_meta.get('encrypted') == 1:
+            self.logger.info("[%s] Data is encrypted.", section_meta.get('name'))
+            return None
+
+        max_decompressed_size = section_meta.get('max_decompressed_size')
+        page_count = section_meta.get('page_count')
+
+        def load(idx):
+            page = bytearray(max_decompressed_size)
+            if not self.get_section_page(section_meta, idx, page, 0):
+                return None
+            return page
+
+        extents = [(idx*max_decompressed_size, max_decompressed_size, idx) for idx in range(page_count)]
+        data = DWGSectionPages(section_meta.get('name'), max_decompressed_size*page_count, extents, load)
+
+        return {'headers': None,
+                'data':    data}
+
+    def get_section_page(self, section_meta, idx, data, offset):
+        """Decompress a page of a section into a buffer (through the page cache)
+
+            A missed page is decompressed in place, then a copy of its range is cached.
+            Page headers are read-only (MappingProxyType), as cached ones are shared.
+
+        Args:
+            section_meta (dict): A section meta stored in the section map
+            idx (int): The page index in the section
+            data (bytearray): The destination buffer
+            offset (int): The destination offset
+
+        Returns:
+            Page header (mapping), None if the page does not exist, or False if the page header is abnormal
+        """
+        page_id = section_meta.get('pages')[idx].get('id')
+        page = self.get_cached_page(page_id)
+        if page is not None:
+            header, page = page
+            data[offset:offset+len(page)] = page
+            return header
+
+        report_mark = len(self.report.vinfo)
+        header = self.read_section_page(section_meta, idx, data, offset)
+        if not header:
+            return header
+
+        header['body'] = MappingProxyType(header['body'])
+        header = MappingProxyType(header)
+        if self.page_cache is not None:
+            # the range written above (an uncompressed page is copied as it is)
+            length = section_meta.get('max_decompressed_size')
+            if section_meta.get('compressed') != 2:
+                length = header['body'].get('compressed_size')
+            page = bytes(data[offset:offset+length])
+            self.put_cached_page(page_id, (header, page), header['size'] + len(page), report_mark)
+        return header
+
+    def read_section_page(self, section_meta, idx, data, offset):
+        """Read a page of a section and decompress it into a buffer
+
+        Args:
+            section_meta (dict): A section meta stored in the section map
+            idx (int): The page index in the section
+            data (bytearray): The destination buffer
+            offset (int): The destination offset
+
+        Returns:
+            Page header (dict), None if the page does not exist, or False if the page header is abnormal
+        """
+        max_decompressed_size = section_meta.get('max_decompressed_size')
+
+        section_page_entry = self.find_page_entry(section_meta.get('pages')[idx].get('id'))
+        if section_page_entry is None:
+            return None
+
+        # offset from file header
+        offset_ff = section_page_entry.get('address')
+
+        # read the whole page (header + compressed data) at once
+        page = self.read_page(offset_ff, max(section_page_entry.get('size'),
+                                             sizeof(DWG_R18_DATA_SECTION_HEADER)))
+
+        # decrypt encrypted header data
+        temp = page[0:sizeof(DWG_R18_DATA_SECTION_HEADER)]
+        temp = bytearray(temp)
+        sec_mask = 0x4164536B ^ offset_ff
+        for i in range(0, 32, 4):
+            byte4 = int.from_bytes(temp[i:i+4], byteorder='little')
+            byte4 ^= sec_mask
+            temp[i:i+4] = byte4.to_bytes(4, byteorder='little')
+        temp = bytes(temp)
+
+        header = dict()
+        header['offset'] = offset_ff
+        header['size'] = sizeof(DWG_R18_DATA_SECTION_HEADER)
+        header['body'] = self.utils.unpack_struct(temp[0:sizeof(DWG_R18_DATA_SECTION_HEADER)],
+                                                  DWG_R18_DATA_SECTION_HEADER)
+
+        # Validate DWG_R18_DATA_SECTION_HEADER
+        if self.validate_DWG_R18_DATA_SECTION_HEADER(header['body'], header['offset'], header['size']) is False:
+            msg = "Abnormal 'DWG_R18_DATA_SECTION_HEADER' structure."
+            self.logger.debug(msg)
+            return False
+
+        # get data stream (if compressed, decompress data)
+        start = header['size']
+        length = header['body'].get('compressed_size')
+        if start + length <= len(page):
+            temp = page[start:start+length]
+        else:
+            # the compressed size runs past the page size in the page map
+            temp = self.read_page(offset_ff + start, length)
+
+        if section_meta.get('compressed') == 2:
+            # decompress the page in place
+            self.utils.decompress_r18_into(
+                temp, len(temp),
+                data, offset, max_decompressed_size
+            )
+        else:
+            data[offset:offset+len(temp)] = temp
+
+        return header
+
     def get_section_map(self, address):
         """Parse the data section map
 
@@ -589,19 +738,18 @@ class DWGFormatR18(DWGFormatBase):
         """
         offset = address
 
-        self.logger.info("{}(): Get a section map.".format(GET_MY_NAME()))
+        self.logger.info("Get a section map.")
 
         header = OrderedDict()
         header['offset'] = offset
         header['size'] = sizeof(DWG_R18_SYSTEM_SECTION_HEADER)
-        header['ss_header'] = self.utils.static_cast(self.file_buf[offset:offset+sizeof(DWG_R18_SYSTEM_SECTION_HEADER)],
-                                                     DWG_R18_SYSTEM_SECTION_HEADER)
-        header['ss_header'] = self.utils.get_dict_from_ctypes_struct(header['ss_header'])
+        header['ss_header'] = self.utils.unpack_struct(self.file_buf[offset:offset+sizeof(DWG_R18_SYSTEM_SECTION_HEADER)],
+                                                       DWG_R18_SYSTEM_SECTION_HEADER)
 
         # Validate DWG_R18_SYSTEM_SECTION_HEADER
         if self.validate_DWG_R18_SYSTEM_SECTION_HEADER(header['ss_header'], header['offset'], header['size']) is False:
             msg = "Abnormal 'DWG_R18_SYSTEM_SECTION_HEADER' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # Decompress compressed 'section page map' data
@@ -610,24 +758,26 @@ class DWGFormatR18(DWGFormatBase):
         if len(data) == 0:
             return header
 
+        if self.mode == DWGParsingMode.VALIDATION:
+            self.verify_system_page_checksum(header, header['ss_header'], data, "section map")
+
         data = self.utils.decompress_r18(data, len(data), header['ss_header'].get('decompressed_size'))
 
         if len(data) != header['ss_header'].get('decompressed_size'):
-            self.logger.debug("{}(): decompressed_size mis-matches.".format(GET_MY_NAME()))
+            self.logger.debug("decompressed_size mis-matches.")
             msg = "[{}] decompressed_size mis-matches.".format("section map")
             self.report.add(DWGVInfo(DWGVType.CORRUPTED, offset, header['ss_header'].get('compressed_size'), msg))
 
         # Get decompressed header of 'section map' data
         offset = 0
-        header['section_map_header'] = self.utils.static_cast(data[offset:offset+sizeof(DWG_R18_SECTION_MAP_HEADER)],
-                                                              DWG_R18_SECTION_MAP_HEADER)
-        header['section_map_header'] = self.utils.get_dict_from_ctypes_struct(header['section_map_header'])
+        header['section_map_header'] = self.utils.unpack_struct(data[offset:offset+sizeof(DWG_R18_SECTION_MAP_HEADER)],
+                                                                DWG_R18_SECTION_MAP_HEADER)
 
         # Validate DWG_R18_SECTION_MAP_HEADER
         if self.validate_DWG_R18_SECTION_MAP_HEADER(header['section_map_header'],
                                                     offset, sizeof(DWG_R18_SECTION_MAP_HEADER)) is False:
             msg = "Abnormal 'DWG_R18_SECTION_MAP_HEADER' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         offset += sizeof(DWG_R18_SECTION_MAP_HEADER)
@@ -636,14 +786,13 @@ class DWGFormatR18(DWGFormatBase):
         section_map = []
 
         for idx in range(header.get('section_map_header').get('section_entry_count')):
-            entry = self.utils.static_cast(data[offset:offset+sizeof(DWG_R18_SECTION_ENTRY)],
-                                           DWG_R18_SECTION_ENTRY)
-            entry = self.utils.get_dict_from_ctypes_struct(entry)
+            entry = self.utils.unpack_struct(data[offset:offset+sizeof(DWG_R18_SECTION_ENTRY)],
+                                             DWG_R18_SECTION_ENTRY)
 
             # Validate DWG_R18_SECTION_ENTRY
             if self.validate_DWG_R18_SECTION_ENTRY(entry, offset, sizeof(DWG_R18_SECTION_ENTRY)) is False:
                 msg = "Abnormal 'DWG_R18_SECTION_ENTRY' structure."
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 return None
 
             offset += sizeof(DWG_R18_SECTION_ENTRY)
@@ -651,15 +800,14 @@ class DWGFormatR18(DWGFormatBase):
             # Get pages related to this section
             entry['pages'] = []
             for count in range(entry.get('page_count')):
-                page = self.utils.static_cast(data[offset:offset+sizeof(DWG_R18_SECTION_ENTRY_PAGE_INFO)],
-                                              DWG_R18_SECTION_ENTRY_PAGE_INFO)
-                page = self.utils.get_dict_from_ctypes_struct(page)
+                page = self.utils.unpack_struct(data[offset:offset+sizeof(DWG_R18_SECTION_ENTRY_PAGE_INFO)],
+                                                DWG_R18_SECTION_ENTRY_PAGE_INFO)
 
                 # Validate DWG_R18_SECTION_ENTRY_PAGE_INFO
                 if self.validate_DWG_R18_SECTION_ENTRY_PAGE_INFO(page, offset,
                                                                  sizeof(DWG_R18_SECTION_ENTRY_PAGE_INFO)) is False:
                     msg = "Abnormal 'DWG_R18_SECTION_ENTRY_PAGE_INFO' structure."
-                    self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                    self.logger.debug(msg)
                     return None
 
                 entry['pages'].append(page)
@@ -667,18 +815,11 @@ class DWGFormatR18(DWGFormatBase):
 
             section_map.append(entry)
 
-        self.logger.info("{}(): {} items in section map.".format(GET_MY_NAME(), len(section_map)))
+        self.logger.info("%d items in section map.", len(section_map))
 
         return {'header': header,
                 'map':    section_map}
 
-    def find_page_entry(self, id):
-        page_map = self.dwg_page_map['map']
-        for entry in page_map:
-            if entry['id'] == id:
-                return entry
-        return None
-
     def get_page_map(self, offset):
         """Parse the page map
 
@@ -686,23 +827,22 @@ class DWGFormatR18(DWGFormatBase):
             Result dict
             {
                 header (dict)
-                map (list)
+                map (DWGPageMap)
                 map_unused (list)
             }
         """
-        self.logger.info("{}(): Get a page map.".format(GET_MY_NAME()))
+        self.logger.info("Get a page map.")
 
         header = OrderedDict()
         header['offset'] = offset
         header['size'] = sizeof(DWG_R18_SYSTEM_SECTION_HEADER)
-        header['body'] = self.utils.static_cast(self.file_buf[offset:offset+sizeof(DWG_R18_SYSTEM_SECTION_HEADER)],
-                                                DWG_R18_SYSTEM_SECTION_HEADER)
-        header['body'] = self.utils.get_dict_from_ctypes_struct(header['body'])
+        header['body'] = self.utils.unpack_struct(self.file_buf[offset:offset+sizeof(DWG_R18_SYSTEM_SECTION_HEADER)],
+                                                  DWG_R18_SYSTEM_SECTION_HEADER)
 
         # Validate DWG_R18_SYSTEM_SECTION_HEADER
         if self.validate_DWG_R18_SYSTEM_SECTION_HEADER(header['body'], header['offset'], header['size']) is False:
             msg = "Abnormal 'DWG_R18_SYSTEM_SECTION_HEADER' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # decompress compressed 'section page map' data
@@ -710,40 +850,39 @@ class DWGFormatR18(DWGFormatBase):
         data = self.file_buf[offset:offset+header['body'].get('compressed_size')]
         if len(data) == 0:
             return None
+
+        if self.mode == DWGParsingMode.VALIDATION:
+            self.verify_system_page_checksum(header, header['body'], data, "page map")
+
         data = self.utils.decompress_r18(data, len(data), header['body'].get('decompressed_size'))
 
         if len(data) != header['body'].get('decompressed_size'):
-            self.logger.debug("{}(): decompressed_size mis-matches.".format(GET_MY_NAME()))
+            self.logger.debug("decompressed_size mis-matches.")
             msg = "[{}] decompressed_size mis-matches.".format("page map")
             self.report.add(DWGVInfo(DWGVType.CORRUPTED, header['offset'], header['size'], msg))
 
-        # Interpret decompressed 'section page map' data
-        page_map = []
+        # Interpret decompressed 'section page map' data (pairs of id & size, in one pass)
+        #   - an unused (negative id) entry is followed by 4 values: parent, left, right, 0x00
+        page_map = DWGPageMap()
         page_map_unused = []
         page_address = 0x100
-        offset = 0
-        decompressed_size = len(data)
-
-        while offset < decompressed_size:
-            entry = dict()
-            entry['id']      = struct.unpack('<i', data[offset+0 : offset+4])[0]
-            entry['size']    = struct.unpack('<i', data[offset+4 : offset+8])[0]
-            entry['address'] = page_address
-            page_address += entry['size']
-            offset += 8
-
-            if entry['id'] < 0:
-                entry['parent'] = struct.unpack('<i', data[offset+ 0 : offset+ 4])[0]
-                entry['left']   = struct.unpack('<i', data[offset+ 4 : offset+ 8])[0]
-                entry['right']  = struct.unpack('<i', data[offset+ 8 : offset+12])[0]
-                entry['x00']    = struct.unpack('<i', data[offset+12 : offset+16])[0]
-                offset += 16
+
+        pairs = struct.iter_unpack('<ii', data[0:len(data) - len(data) % 8])
+        for id, size in pairs:
+            if id < 0:
+                entry = dict()
+                entry['id']      = id
+                entry['size']    = size
+                entry['address'] = page_address
+                entry['parent'], entry['left']  = next(pairs, (0, 0))
+                entry['right'],  entry['x00']   = next(pairs, (0, 0))
                 page_map_unused.append(entry)
             else:
-                page_map.append(entry)
+                page_map.append(id, size, page_address)
+            page_address += size
 
-        self.logger.info("{}(): {} items in page map.".format(GET_MY_NAME(), len(page_map)))
-        self.logger.info("{}(): {} items in page map (unused).".format(GET_MY_NAME(), len(page_map_unused)))
+        self.logger.info("%d items in page map.", len(page_map))
+        self.logger.info("%d items in page map (unused).", len(page_map_unused))
 
         return {'header': header,
                 'map':    page_map,
@@ -760,20 +899,19 @@ class DWGFormatR18(DWGFormatBase):
                 body (DWG_R21_FILE_HEADER_2ND)
             }
         """
-        self.logger.info("{}(): Get the 1st and 2nd file headers.".format(GET_MY_NAME()))
+        self.logger.info("Get the 1st and 2nd file headers.")
 
         d = dict()
         d['offset'] = offset
         d['size'] = sizeof(DWG_R18_FILE_HEADER_1ST) + sizeof(DWG_R18_FILE_HEADER_2ND)
-        d['body'] = self.utils.static_cast(self.file_buf[offset:offset+sizeof(DWG_R18_FILE_HEADER_1ST)],
-                                           DWG_R18_FILE_HEADER_1ST)
-        data = bytearray(d['body'].encrypted_header)
-        d['body'] = self.utils.get_dict_from_ctypes_struct(d['body'])
+        d['body'] = self.utils.unpack_struct(self.file_buf[offset:offset+sizeof(DWG_R18_FILE_HEADER_1ST)],
+                                             DWG_R18_FILE_HEADER_1ST)
+        data = bytearray(d['body'].get('encrypted_header'))
 
         # Validate DWG_R18_FILE_HEADER_1ST
         if self.validate_DWG_R18_FILE_HEADER_1ST(d['body'], d['offset'], d['size']) is False:
             msg = "Abnormal 'DWG_R18_FILE_HEADER_1ST' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # Set the 1st file header
@@ -791,25 +929,86 @@ class DWGFormatR18(DWGFormatBase):
         d['size'] = 0x400
 
         data = bytes(data)
-        d['body'] = self.utils.static_cast(data[offset:offset+sizeof(DWG_R18_FILE_HEADER_2ND)],
-                                           DWG_R18_FILE_HEADER_2ND)
-        d['body'] = self.utils.get_dict_from_ctypes_struct(d['body'])
+        d['body'] = self.utils.unpack_struct(data[offset:offset+sizeof(DWG_R18_FILE_HEADER_2ND)],
+                                             DWG_R18_FILE_HEADER_2ND)
 
         # Validate DWG_R18_FILE_HEADER_2ND
         if self.validate_DWG_R18_FILE_HEADER_2ND(d['body'], d['offset'], d['size']) is False:
             msg = "Abnormal 'DWG_R18_FILE_HEADER_2ND' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # CRC check
         data = data[:-4] + (b'\x00' * 4)
         v = self.check_crc(data, d.get('body').get('crc32'))
         if v is False:
-            self.logger.debug("{}(): CRC check failed.".format(GET_MY_NAME()))
+            self.logger.debug("CRC check failed.")
             self.report.add(DWGVInfo(DWGVType.INVALID_CRC, d['offset'], d['size']))
 
         return d
 
+    def verify_data_page_checksum(self, header, header_data, data, name=""):
+        """Verify checksums of a data page and report mismatches
+
+            data checksum  : compressed data (seed 0)
+            header checksum: decrypted header with the header checksum set to 0 (seed: data checksum)
+
+        Args:
+            header (dict): header dict. of the data page
+            header_data (bytes): decrypted header data (DWG_R18_DATA_SECTION_HEADER)
+            data (bytes): compressed data
+            name (str): section name
+
+        Returns:
+            True or False
+        """
+        body = header.get('body')
+        result = True
+
+        if self.verify_checksum(data, 0, body.get('data_checksum')) is False:
+            msg = "[{}] Data checksum mis-matches.".format(name)
+            self.logger.debug(msg)
+            self.report.add(DWGVInfo(DWGVType.INVALID_CRC, header['offset'] + header['size'], len(data), msg))
+            result = False
+
+        header_data = bytearray(header_data[0:sizeof(DWG_R18_DATA_SECTION_HEADER)])
+        field = DWG_R18_DATA_SECTION_HEADER.page_header_checksum
+        header_data[field.offset:field.offset+field.size] = bytes(field.size)
+        if self.verify_checksum(header_data, body.get('data_checksum'), body.get('page_header_checksum')) is False:
+            msg = "[{}] Page header checksum mis-matches.".format(name)
+            self.logger.debug(msg)
+            self.report.add(DWGVInfo(DWGVType.INVALID_CRC, header['offset'], header['size'], msg))
+            result = False
+
+        return result
+
+    def verify_system_page_checksum(self, header, body, data, name=""):
+        """Verify the checksum of a system page (page map, section map) and report a mismatch
+
+            The checksum covers compressed data (seed 0) and then
+            the header with the checksum set to 0 (seed: data checksum).
+
+        Args:
+            header (dict): header dict. of the system page ('offset' and 'size')
+            body (dict): DWG_R18_SYSTEM_SECTION_HEADER dict.
+            data (bytes): compressed data
+            name (str): page name
+
+        Returns:
+            True or False
+        """
+        offset = header['offset']
+        header_data = bytearray(self.file_buf[offset:offset+sizeof(DWG_R18_SYSTEM_SECTION_HEADER)])
+        field = DWG_R18_SYSTEM_SECTION_HEADER.checksum
+        header_data[field.offset:field.offset+field.size] = bytes(field.size)
+
+        if self.verify_checksum(header_data, self.checksum(data, 0), body.get('checksum')) is False:
+            msg = "[{}] Checksum mis-matches.".format(name)
+            self.logger.debug(msg)
+            self.report.add(DWGVInfo(DWGVType.INVALID_CRC, offset, header['size'] + len(data), msg))
+            return False
+        return True
+
     def verify_checksum(self, data, seed, saved_value):
         """Verify the checksum value
 
@@ -836,23 +1035,7 @@ class DWGFormatR18(DWGFormatBase):
         Returns:
             Checksum value (int)
         """
-        sum1 = ctypes.c_uint32(seed & 0xFFFF).value
-        sum2 = ctypes.c_uint32(seed >> 0x10).value
-        pos  = 0
-        size = len(data)
-
-        while size != 0:
-            chunk_size = min(0x15B0, size)
-            size -= chunk_size
-            for idx in range(chunk_size):
-                sum1 += data[pos]
-                pos += 1
-                sum2 += sum1
-            sum1 %= 0xFFF1
-            sum2 %= 0xFFF1
-
-        sum = ctypes.c_uint32((sum2 << 0x10) | (sum1 & 0xFFFF)).value
-        return sum
+        return self.utils.checksum(data, seed)
 
     def check_crc(self, data, saved_crc):
         """Check the CRC value
@@ -22,6 +22,8 @@ from .dwg_bit_codes import *
 from .dwg_report import *
 from .dwg_section_decoder import *
 from .dwg_format_base import DWGFormatBase
+from .dwg_page_map import DWGPageMap
+from .dwg_section_pages import DWGSectionPages
 
 
 class DWGFormatR21(DWGFormatBase):
@@ -54,7 +56,7 @@ class DWGFormatR21(DWGFormatBase):
         self.dwg_file_header_2nd = self.get_file_header(offset)
         if self.dwg_file_header_2nd.get('body') is None:
             msg = "2nd file header is invalid."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, -1, -1, msg))
             return False
 
@@ -65,18 +67,20 @@ class DWGFormatR21(DWGFormatBase):
         '''
         # page map
         self.dwg_page_map = self.get_page_map()
+        self.build_page_index()
 
         # section map
         id = self.dwg_file_header_2nd.get('body').get('sections_map_id')
         page_entry = self.find_page_entry(id)
         if page_entry is None:
             msg = "Cannot find the section map."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, -1, -1, msg))
             return False
 
         address = page_entry.get('address')
         self.dwg_section_map = self.get_section_map(address)
+        self.build_section_index()
 
         # build section entry list
         # if self.build_section_entry_list() == 0:
@@ -104,75 +108,125 @@ class DWGFormatR21(DWGFormatBase):
         =============================================================
         '''
         '''-------------------------------------------------------'''
-        security_flags = self.dwg_file_header_1st.get('body').get('security_flags')
-        if security_flags > 0:
-            section = self.get_section_data_by_hashcode(DWGSectionHashCode.SECURITY)
-            if section is not None:
-                self.dwg_filedeplist = self.decoder.security(section)
+        if self.mode == DWGParsingMode.METADATA:
+            # data sections are decoded when their attributes are first read
+            return True
+
+        self.load_data_sections()
 
         '''-------------------------------------------------------'''
-        app_version = self.dwg_file_header_1st.get('body').get('app_version')
+        if self.mode == DWGParsingMode.VALIDATION:
+            return True
 
-        section = self.get_section_data_by_hashcode(DWGSectionHashCode.APPINFO)
+        '''-------------------------------------------------------'''
+        # Get all objects with object map from AcDb:AcDbObjects
+        section = self.get_object_section()
         if section is not None:
-            self.dwg_appinfo = self.decoder.appinfo(section, app_version)
+            self.dwg_objects = self.decoder.objects(section, self.dwg_object_map)
+
+        # Get all objects by carving
+        # unfortunately, there is little chance to have unused area in AcDbObjects data stream
+        return True
+
+    def load_security(self):
+        """Decode AcDb:Security (encryption settings)
+        """
+        security_flags = self.dwg_file_header_1st.get('body').get('security_flags')
+        if security_flags <= 0:
+            return None
 
+        section = self.get_section_data_by_hashcode(DWGSectionHashCode.SECURITY)
+        if section is None:
+            return None
+        return self.decoder.security(section)
+
+    def load_summaryinfo(self):
+        """Decode AcDb:SummaryInfo (document properties)
+        """
+        section = self.get_section_data_by_hashcode(DWGSectionHashCode.SUMMARYINFO)
+        if section is None:
+            return None
+        return self.decoder.summaryinfo(section, DWGEncoding.UTF16LE.value)
+
+    def load_appinfo(self):
+        """Decode AcDb:AppInfo (application info.)
+        """
+        section = self.get_section_data_by_hashcode(DWGSectionHashCode.APPINFO)
+        if section is None:
+            return None
+        return self.decoder.appinfo(section, self.dwg_file_header_1st.get('body').get('app_version'))
+
+    def load_appinfohistory(self):
+        """Decode AcDb:AppInfoHistory (application info.)
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.APPINFOHISTORY)
-        if section is not None:
-            self.dwg_appinfohistory = self.decoder.appinfohistory(section, app_version)
+        if section is None:
+            return None
+        return self.decoder.appinfohistory(section, self.dwg_file_header_1st.get('body').get('app_version'))
 
-        '''-------------------------------------------------------'''
+    def load_auxheader(self):
+        """Decode AcDb:AuxHeader (document properties, additional)
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.AUXHEADER)
-        if section is not None:
-            self.dwg_auxheader = self.decoder.auxheader(section)
+        if section is None:
+            return None
+        return self.decoder.auxheader(section)
 
-        '''-------------------------------------------------------'''
+    def load_preview(self):
+        """Decode AcDb:Preview (preview images)
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.PREVIEW)
-        if section is not None:
-            self.dwg_preview = self.decoder.preview(section)
-
-        '''-------------------------------------------------------'''
-        section = self.get_section_data_by_hashcode(DWGSectionHashCode.SUMMARYINFO)
-        if section is not None:
-            self.dwg_summaryinfo = self.decoder.summaryinfo(section, DWGEncoding.UTF16LE.value)
+        if section is None:
+            return None
+        return self.decoder.preview(section)
 
-        '''-------------------------------------------------------'''
+    def load_header(self):
+        """Decode AcDb:Header (header variables, base handle values)
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.HEADER)
-        if section is not None:
-            self.dwg_header = self.decoder.header(section)
+        if section is None:
+            return None
+        return self.decoder.header(section)
 
-        '''-------------------------------------------------------'''
+    def load_filedeplist(self):
+        """Decode AcDb:FileDepList (file dependencies)
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.FILEDEPLIST)
-        if section is not None:
-            self.dwg_filedeplist = self.decoder.filedeplist(section, DWGEncoding.UTF16LE.value)
+        if section is None:
+            return None
+        return self.decoder.filedeplist(section, DWGEncoding.UTF16LE.value)
 
-        '''-------------------------------------------------------'''
-        # Get defined classes from AcDb:Classes
+    def load_classes(self):
+        """Decode AcDb:Classes (custom classes) and pass them to the object decoder
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.CLASSES)
-        if section is not None:
-            self.dwg_classes = self.decoder.classes(section)
-            self.decoder.object.set_classes(self.dwg_classes.get('classes'))
+        if section is None:
+            return None
 
-        '''-------------------------------------------------------'''
-        # Build the object map for locating objects using AcDb:Handles
+        classes = self.decoder.classes(section)
+        self.decoder.object.set_classes(classes.get('classes'))
+        return classes
+
+    def load_object_map(self):
+        """Build the object map for locating objects using AcDb:Handles
+        """
         section = self.get_section_data_by_hashcode(DWGSectionHashCode.HANDLES)
-        if section is not None:
-            self.dwg_object_map = self.build_object_map(section)
+        if section is None:
+            return None
+        return self.build_object_map(section)
 
-        '''-------------------------------------------------------'''
-        if self.mode == DWGParsingMode.METADATA or \
-           self.mode == DWGParsingMode.VALIDATION:
-            return True
+    def read_object_section(self):
+        """Read the AcDb:AcDbObjects section as a paged view (see DWGSectionPages)
 
-        '''-------------------------------------------------------'''
-        # Get all objects with object map from AcDb:AcDbObjects
-        section = self.get_section_data_by_hashcode(DWGSectionHashCode.ACDBOBJECTS)
-        if section is not None:
-            self.dwg_objects = self.decoder.objects(section, self.dwg_object_map)
+        Returns:
+            Section data (dict) or None
+        """
+        section_meta = self.dwg_section_hash_index.get(DWGSectionHashCode.ACDBOBJECTS)
+        if section_meta is None:
+            self.logger.info("[section map] Do not exist the section code '%s'.", DWGSectionHashCode.ACDBOBJECTS)
+            return None
 
-        # Get all objects by carving
-        # unfortunately, there is little chance to have unused area in AcDbObjects data stream
-        return True
+        return self.get_section_pages(section_meta)
 
     def save_section_data(self):
         """Save all section data for debugging
@@ -230,7 +284,7 @@ class DWGFormatR21(DWGFormatBase):
                 if last_offset < 0 or self.file_size < last_offset:
                     msg = "[{}] Found an abnormal address value at {}th entry.".format(
                             DWGSectionName.HANDLES.value, len(object_map))
-                    self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                    self.logger.debug(msg)
                     self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
 
                 object_map.append({'handle': last_handle,
@@ -241,7 +295,7 @@ class DWGFormatR21(DWGFormatBase):
 
         # Validate CRC value
 
-        self.logger.info("{}(): {} items in object map.".format(GET_MY_NAME(), len(object_map)))
+        self.logger.info("%d items in object map.", len(object_map))
         return object_map
 
     def build_section_entry_list(self):
@@ -323,15 +377,10 @@ class DWGFormatR21(DWGFormatBase):
                 data   : decompressed data stream
             }
         """
-        section_meta = None
-        for item in self.dwg_section_map.get('map'):
-            if item.get('hash_code') == hash_code:
-                section_meta = item
-                break
+        section_meta = self.dwg_section_hash_index.get(hash_code)
 
         if section_meta is None:
-            msg = "[{}] Do not exist the section code '{}'.".format("section map", hash_code)
-            self.logger.info("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.info("[section map] Do not exist the section code '%s'.", hash_code)
             return None
 
         return self.get_section_data(section_meta)
@@ -349,19 +398,14 @@ class DWGFormatR21(DWGFormatBase):
                 data : decompressed (+ decoded) data stream
             }
         """
-        self.logger.info("{}(): Get data of the section {}.".format(
-                GET_MY_NAME(),
-                section.get('name'))
-        )
+        self.logger.info("Get data of the section %s.", section.get('name'))
 
         # 0 (if not encrypted), 2 (meaning unknown)
         if section.get('encrypted') == 1:
-            msg = "[{}] Data is encrypted.".format(section.get('name'))
-            self.logger.info("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.info("[%s] Data is encrypted.", section.get('name'))
             return None
 
         '''======================================================'''
-        rs_method = section.get('encoded')
         total_decompressed_size = section.get('size')
         data = bytearray(total_decompressed_size)
         '''======================================================'''
@@ -373,24 +417,9 @@ class DWGFormatR21(DWGFormatBase):
                 continue
             pages.append(page)
 
-            '''======================================================'''
-            # Get the address of data
-            address = page.get('address')
-
-            # Get related variables
-            size_compressed   = section.get('pages')[idx].get('size_compressed')
-            size_uncompressed = section.get('pages')[idx].get('size_uncompressed')
             offset = section.get('pages')[idx].get('offset')
-
-            # Read (+ decode & decompress) the data page
-            temp = self.read_data_page(
-                    address,
-                    size_compressed, size_uncompressed,
-                    page.get('size'),
-                    rs_method
-            )
-
-            data[offset:offset+size_uncompressed] = temp
+            size_uncompressed = section.get('pages')[idx].get('size_uncompressed')
+            data[offset:offset+size_uncompressed] = self.get_section_page(section, idx, page)
 
         # Print hex data
         # self.utils.print_dict(section, "Section Map")
@@ -402,16 +431,92 @@ class DWGFormatR21(DWGFormatBase):
         meta['pages'] = pages
 
         if len(data) != total_decompressed_size:
-            self.logger.debug("{}(): decompressed_size mis-matches.".format(GET_MY_NAME()))
+            self.logger.debug("decompressed_size mis-matches.")
             msg = "[{}] decompressed_size mis-matches.".format(section.get('name'))
             self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
 
-        msg = "Totally {} bytes.".format(len(data))
-        self.logger.info("{}(): {}".format(GET_MY_NAME(), msg))
+        self.logger.info("Totally %d bytes.", len(data))
 
         return {'meta': meta,
                 'data': bytes(data)}
 
+    def get_section_pages(self, section):
+        """Get a section data as a paged view (pages are decoded & decompressed on demand)
+
+        Args:
+            section (dict): A section meta stored in the section map
+
+        Returns:
+            Result data (dict) or None
+            {
+                meta : metadata on this section
+                data : decompressed (+ decoded) data stream (DWGSectionPages)
+            }
+        """
+        self.logger.info("Get paged data of the section %s.", section.get('name'))
+
+        if section.get('encrypted') == 1:
+            self.logger.info("[%s] Data is encrypted.", section.get('name'))
+            return None
+
+        pages = []
+        extents = []
+        for idx in range(section.get('page_count')):
+            page = self.find_page_entry(section.get('pages')[idx].get('id'))
+            if page is None:
+                continue
+            pages.append(page)
+            extents.append((section.get('pages')[idx].get('offset'),
+                            section.get('pages')[idx].get('size_uncompressed'),
+                            idx))
+
+        def load(idx):
+            return self.get_section_page(section, idx, self.find_page_entry(section.get('pages')[idx].get('id')))
+
+        meta = OrderedDict()
+        meta['name'] = section.get('name')
+        meta['pages'] = pages
+
+        return {'meta': meta,
+                'data': DWGSectionPages(section.get('name'), section.get('size'), extents, load)}
+
+    def get_section_page(self, section, idx, page):
+        """Get a decompressed page of a section (through the page cache)
+
+        Args:
+            section (dict): A section meta stored in the section map
+            idx (int): The page index in the section
+            page (dict): The page map entry of the page
+
+        Returns:
+            Decompressed data (bytes)
+        """
+        data = self.get_cached_page(page.get('id'))
+        if data is None:
+            report_mark = len(self.report.vinfo)
+            data = bytes(self.read_section_page(section, idx, page))
+            self.put_cached_page(page.get('id'), data, len(data), report_mark)
+        return data
+
+    def read_section_page(self, section, idx, page):
+        """Read (+ decode & decompress) a page of a section
+
+        Args:
+            section (dict): A section meta stored in the section map
+            idx (int): The page index in the section
+            page (dict): The page map entry of the page
+
+        Returns:
+            Decompressed data (bytes)
+        """
+        page_info = section.get('pages')[idx]
+        return self.read_data_page(
+                page.get('address'),
+                page_info.get('size_compressed'), page_info.get('size_uncompressed'),
+                page.get('size'),
+                section.get('encoded')
+        )
+
     def get_section_map(self, address):
         """Parse the section map
 
@@ -427,7 +532,7 @@ class DWGFormatR21(DWGFormatBase):
         """
         offset = address
 
-        self.logger.info("{}(): Get a section map.".format(GET_MY_NAME()))
+        self.logger.info("Get a section map.")
 
         # Get related variables
         size_compressed   = self.dwg_file_header_2nd.get('body').get('sections_map_size_compressed')
@@ -448,14 +553,13 @@ class DWGFormatR21(DWGFormatBase):
 
         while idx < total_size:
             # Get a section entry
-            entry = self.utils.static_cast(data[idx:idx+sizeof(DWG_R21_SECTION_ENTRY)],
-                                           DWG_R21_SECTION_ENTRY)
-            entry = self.utils.get_dict_from_ctypes_struct(entry)
+            entry = self.utils.unpack_struct(data[idx:idx+sizeof(DWG_R21_SECTION_ENTRY)],
+                                             DWG_R21_SECTION_ENTRY)
 
             # Validate DWG_R21_SECTION_ENTRY
             if self.validate_DWG_R21_SECTION_ENTRY(entry, offset, total_size) is False:
                 msg = "Abnormal 'validate_DWG_R21_SECTION_ENTRY' structure."
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 break
 
             idx += sizeof(DWG_R21_SECTION_ENTRY)
@@ -476,14 +580,13 @@ class DWGFormatR21(DWGFormatBase):
             # Get pages related to this section
             entry['pages'] = []
             for pc in range(entry.get('page_count')):
-                page = self.utils.static_cast(data[idx:idx+sizeof(DWG_R21_SECTION_ENTRY_PAGE_INFO)],
-                                              DWG_R21_SECTION_ENTRY_PAGE_INFO)
-                page = self.utils.get_dict_from_ctypes_struct(page)
+                page = self.utils.unpack_struct(data[idx:idx+sizeof(DWG_R21_SECTION_ENTRY_PAGE_INFO)],
+                                                DWG_R21_SECTION_ENTRY_PAGE_INFO)
 
                 # Validate DWG_R21_SECTION_ENTRY_PAGE_INFO
                 if self.validate_DWG_R21_SECTION_ENTRY_PAGE_INFO(page, idx, sizeof(DWG_R21_SECTION_ENTRY_PAGE_INFO)) is False:
                     msg = "Abnormal 'DWG_R21_SECTION_ENTRY_PAGE_INFO' structure."
-                    self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                    self.logger.debug(msg)
                     break
 
                 idx += sizeof(DWG_R21_SECTION_ENTRY_PAGE_INFO)
@@ -493,18 +596,11 @@ class DWGFormatR21(DWGFormatBase):
 
             section_map.append(entry)
 
-        self.logger.info("{}(): {} items in section map.".format(GET_MY_NAME(), len(section_map)))
+        self.logger.info("%d items in section map.", len(section_map))
 
         return {'header': None,
                 'map':    section_map}
 
-    def find_page_entry(self, id):
-        page_map = self.dwg_page_map['map']
-        for entry in page_map:
-            if entry['id'] == id:
-                return entry
-        return None
-
     def read_data_page(self, address, size_compressed, size_uncompressed, page_size, rs_method):
         """Read the data page(s)
 
@@ -549,10 +645,11 @@ class DWGFormatR21(DWGFormatBase):
 
         # Read data
         page_size = max(page_size, 251 * block_count)
-        data = self.file_buf[address:address+page_size]
+        data = self.read_page(address, page_size)
 
         # Decode RS-encoded data
-        data = self.utils.decode_reed_solomon(data, 251, block_count, rs_method)
+        data = self.utils.decode_reed_solomon(data, 251, block_count, rs_method,
+                                              correct=self.rs_correction, offset=address)
 
         # Print decoded data
         # self.utils.print_hex_bytes(data, 32)
@@ -613,10 +710,11 @@ class DWGFormatR21(DWGFormatBase):
         page_size, block_count = get_values(size_compressed, correction_factor)
 
         # Read data
-        data = self.file_buf[address:address+page_size]
+        data = self.read_page(address, page_size)
 
         # Decode RS-encoded data
-        data = self.utils.decode_reed_solomon(data, 239, block_count)
+        data = self.utils.decode_reed_solomon(data, 239, block_count,
+                                              correct=self.rs_correction, offset=address)
 
         if size_compressed < size_uncompressed:
             data = self.utils.decompress_r21(
@@ -635,7 +733,7 @@ class DWGFormatR21(DWGFormatBase):
             Result dict
             {
                 header  (None in R21)
-                map     (list of dict)
+                map     (DWGPageMap)
             }
         """
         # Calculate the start offset
@@ -653,54 +751,40 @@ class DWGFormatR21(DWGFormatBase):
                 size_compressed, size_uncompressed, correction_factor
         )
 
-        # Parse the page map structure
-        # page_map = [None] * (self.dwg_file_header_2nd.get('body').get('pages_max_id') + 1)
-        page_map = []
-        total_size = len(data)
+        # Parse the page map structure (pairs of size & id, in one pass)
+        page_map = DWGPageMap()
+        pages_max_id = self.dwg_file_header_2nd.get('body').get('pages_max_id')
         address = 0x480
-        idx = 0
-        msg_bak = ""
 
-        while idx < total_size:
-            entry = OrderedDict()
-            entry['size']    = struct.unpack('<q', data[idx+ 0 : idx+ 8])[0]
-            entry['id']      = struct.unpack('<q', data[idx+ 8 : idx+16])[0]
-            entry['address'] = address
-            address += entry['size']
-            idx += 16
-
-            if entry['id'] < 0:
-                a = 1  # what happened?
-
-            id = entry['id'] if entry['id'] > 0 else -entry['id']
-            if id <= 0 or self.dwg_file_header_2nd.get('body').get('pages_max_id') < id:
-                msg = "[{}] Found an abnormal ID {} at {}th entry.".format("page map", id, len(page_map))
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+        for size, id in struct.iter_unpack('<qq', data[0:len(data) - len(data) % 16]):
+            abs_id = id if id > 0 else -id
+            if abs_id <= 0 or pages_max_id < abs_id:
+                msg = "[{}] Found an abnormal ID {} at {}th entry.".format("page map", abs_id, len(page_map))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
                 break
 
-            size = entry['size']
-            if size <= 0 or self.file_size <= entry['address'] + size:
+            if size <= 0 or self.file_size <= address + size:
                 msg = "[{}] Found an abnormal Size {} at {}th entry.".format("page map", size, len(page_map))
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
                 break
 
-            if entry['address'] <= 0 or self.file_size <= entry['address']:
-                msg = "[{}] Found an abnormal Address {} at {}th entry.".format("page map", entry['address'], len(page_map))
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            if address <= 0 or self.file_size <= address:
+                msg = "[{}] Found an abnormal Address {} at {}th entry.".format("page map", address, len(page_map))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
                 break
 
-            # page_map[id] = entry  # for accessing an entry directly through ID value
-            page_map.append(entry)
+            page_map.append(id, size, address)
+            address += size
 
         if self.dwg_file_header_2nd.get('body').get('pages_max_id') < len(page_map):
             msg = "[{}] page entry count mis-matches.".format("page map")
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
 
-        self.logger.info("{}(): {} items in page map.".format(GET_MY_NAME(), len(page_map)))
+        self.logger.info("%d items in page map.", len(page_map))
 
         return {'header': None,
                 'map':    page_map}
@@ -717,19 +801,18 @@ class DWGFormatR21(DWGFormatBase):
                 body (DWG_R21_FILE_HEADER_2ND_BODY)
             }
         """
-        self.logger.info("{}(): Get the 1st and 2nd file headers.".format(GET_MY_NAME()))
+        self.logger.info("Get the 1st and 2nd file headers.")
 
         d = dict()
         d['offset'] = offset
         d['size'] = sizeof(DWG_R21_FILE_HEADER_1ST)
-        d['body'] = self.utils.static_cast(self.file_buf[offset:offset+sizeof(DWG_R21_FILE_HEADER_1ST)],
-                                           DWG_R21_FILE_HEADER_1ST)
-        d['body'] = self.utils.get_dict_from_ctypes_struct(d['body'])
+        d['body'] = self.utils.unpack_struct(self.file_buf[offset:offset+sizeof(DWG_R21_FILE_HEADER_1ST)],
+                                             DWG_R21_FILE_HEADER_1ST)
 
         # Validate DWG_R21_FILE_HEADER_1ST
         if self.validate_DWG_R21_FILE_HEADER_1ST(d.get('body'), d['offset'], d['size']) is False:
             msg = "Abnormal 'DWG_R21_FILE_HEADER_1ST' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # Set the 1st file header
@@ -738,21 +821,21 @@ class DWGFormatR21(DWGFormatBase):
         # Get data of 2nd file header
         offset = 0x80
         data = self.file_buf[offset:offset+0x3D8]
-        data = self.utils.decode_reed_solomon(data, k=239, block_count=3)
+        data = self.utils.decode_reed_solomon(data, k=239, block_count=3,
+                                              correct=self.rs_correction, offset=offset)
 
         d = dict()
         d['offset'] = 0x80
         d['size'] = 0x400
 
         offset = 0
-        d['head'] = self.utils.static_cast(data[offset:offset+sizeof(DWG_R21_FILE_HEADER_2ND_HEAD)],
-                                           DWG_R21_FILE_HEADER_2ND_HEAD)
-        d['head'] = self.utils.get_dict_from_ctypes_struct(d['head'])
+        d['head'] = self.utils.unpack_struct(data[offset:offset+sizeof(DWG_R21_FILE_HEADER_2ND_HEAD)],
+                                             DWG_R21_FILE_HEADER_2ND_HEAD)
 
         # Validate DWG_R21_FILE_HEADER_2ND_HEAD
         if self.validate_DWG_R21_FILE_HEADER_2ND_HEAD(d.get('head'), d['offset'], d['size']) is False:
             msg = "Abnormal 'validate_DWG_R21_FILE_HEADER_2ND_HEAD' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         offset = 0x20
@@ -761,38 +844,36 @@ class DWGFormatR21(DWGFormatBase):
         if length < 0:
             length = -length
             data = data[offset:offset+length]
-            self.logger.debug("{}(): 2nd file header is not compressed.".format(GET_MY_NAME()))
+            self.logger.debug("2nd file header is not compressed.")
         elif length > 0:
             data = self.utils.decompress_r21(data[offset:offset+length], 0x110)
         else:
-            self.logger.debug("{}(): 2nd file header is not compressed.".format(GET_MY_NAME()))
+            self.logger.debug("2nd file header is not compressed.")
             return d
 
         if length < sizeof(DWG_R21_FILE_HEADER_2ND_HEAD):
-            self.logger.debug("{}(): compressed_size is invalid for the 2nd file header.".format(GET_MY_NAME()))
+            self.logger.debug("compressed_size is invalid for the 2nd file header.")
 
-        d['body'] = self.utils.static_cast(data[0:sizeof(DWG_R21_FILE_HEADER_2ND_BODY)],
-                                           DWG_R21_FILE_HEADER_2ND_BODY)
-        d['body'] = self.utils.get_dict_from_ctypes_struct(d['body'])
+        d['body'] = self.utils.unpack_struct(data[0:sizeof(DWG_R21_FILE_HEADER_2ND_BODY)],
+                                             DWG_R21_FILE_HEADER_2ND_BODY)
 
         # Validate DWG_R21_FILE_HEADER_2ND_BODY
         if self.validate_DWG_R21_FILE_HEADER_2ND_BODY(d.get('body'), offset, length) is False:
             msg = "Abnormal 'validate_DWG_R21_FILE_HEADER_2ND_BODY' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # Last 0x28 bytes consists of check data (5 64-bits CRC?)
         offset = 0x80 + 0x3D8
         length = sizeof(DWG_R21_FILE_HEADER_2ND_TAIL)
         data = self.file_buf[offset:offset+length]
-        d['tail'] = self.utils.static_cast(data[0:0+sizeof(DWG_R21_FILE_HEADER_2ND_TAIL)],
-                                           DWG_R21_FILE_HEADER_2ND_TAIL)
-        d['tail'] = self.utils.get_dict_from_ctypes_struct(d['tail'])
+        d['tail'] = self.utils.unpack_struct(data[0:0+sizeof(DWG_R21_FILE_HEADER_2ND_TAIL)],
+                                             DWG_R21_FILE_HEADER_2ND_TAIL)
 
         # Validate DWG_R21_FILE_HEADER_2ND_TAIL
         if self.validate_DWG_R21_FILE_HEADER_2ND_TAIL(d.get('tail'), offset, length) is False:
             msg = "Abnormal 'DWG_R21_FILE_HEADER_2ND_TAIL' structure."
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             return None
 
         # # CRC check
@@ -828,23 +909,7 @@ class DWGFormatR21(DWGFormatBase):
         Returns:
             Checksum value (int)
         """
-        sum1 = ctypes.c_uint32(seed & 0xFFFF).value
-        sum2 = ctypes.c_uint32(seed >> 0x10).value
-        pos  = 0
-        size = len(data)
-
-        while size != 0:
-            chunk_size = min(0x15B0, size)
-            size -= chunk_size
-            for idx in range(chunk_size):
-                sum1 += data[pos]
-                pos += 1
-                sum2 += sum1
-            sum1 %= 0xFFF1
-            sum2 %= 0xFFF1
-
-        sum = ctypes.c_uint32((sum2 << 0x10) | (sum1 & 0xFFFF)).value
-        return sum
+        return self.utils.checksum(data, seed)
 
     def check_crc(self, data, saved_crc):
         """Check the CRC value
@@ -21,6 +21,7 @@ from .dwg_common import *
 from .dwg_utils import *
 from .dwg_bit_codes import *
 from .dwg_report import *
+from .dwg_record import make_object_record
 
 
 class DWGObject:
@@ -33,6 +34,7 @@ class DWGObject:
         self.utils = DWGUtils()
         self.bc = DWGBitCodes(None, 0)
         self.classes = []
+        self.dispatch_table = []    # type code -> (name, class, decoder) or None
 
         # The current object's class
         self.obj_type = 0x00
@@ -41,10 +43,56 @@ class DWGObject:
 
         self.logger = logging.getLogger(__name__)
         self.report = report
+
+        self.build_dispatch_table()
         return
 
     def set_classes(self, classes):
         self.classes = classes
+        self.build_dispatch_table()
+
+    def build_dispatch_table(self):
+        """Build the type code -> (name, class, decoder) table
+
+            Fixed types come from DWGObjectType and types from 500 on from the classes (classes[type-500]).
+            Types without a decoder function use default().
+        """
+        size = 500 + len(self.classes) if self.classes else len(OBJECT_TYPE_TABLE)
+        self.dispatch_table = [None] * size
+
+        for type in range(size):
+            name = self.utils.get_object_name(type, self.classes)
+            if name == '' or name == "UNUSED":
+                continue
+
+            decoder = getattr(self, name, self.default)
+            self.dispatch_table[type] = (name, self.utils.get_object_class(type, self.classes), decoder)
+
+    def get_type_codes(self, types):
+        """Get the type codes of object types
+
+        Args:
+            types (iterable): Type codes (int), names (str, e.g. 'INSERT' or a class DXF name)
+                              or DWGObjectType items
+
+        Returns:
+            Set of type codes
+        """
+        codes = set()
+        names = set()
+        for item in types:
+            if isinstance(item, DWGObjectType):
+                codes.add(item.get_code)
+            elif isinstance(item, str):
+                names.add(item)
+            else:
+                codes.add(item)
+
+        if len(names) > 0:
+            for type, entry in enumerate(self.dispatch_table):
+                if entry is not None and entry[0] in names:
+                    codes.add(type)
+        return codes
 
     def decode(self, buf, pos_bit, size):
         """Decode a DWG entity or object
@@ -54,7 +102,7 @@ class DWGObject:
             pos_bit (int): The current bit position
             size (int): Size of buf
         Returns:
-            Result dict
+            Decoded object (DWGObjectRecord with dict-style access; to_dict() for a dict)
         """
         self.bc = DWGBitCodes(buf, size, pos_bit=pos_bit)
 
@@ -62,20 +110,15 @@ class DWGObject:
         self.obj_type = obj['type'] = self.bc.read_bs()
 
         # call the decoder function for 'type'
-        func_name = self.utils.get_object_name(self.obj_type, self.classes)
-        if func_name == '' or func_name == "UNUSED":
+        if self.obj_type >= len(self.dispatch_table) or self.dispatch_table[self.obj_type] is None:
             return None
 
+        func_name, obj_class, decode_object = self.dispatch_table[self.obj_type]
         self.obj_name  = obj['name'] = func_name
-        self.obj_class = obj['class'] = self.utils.get_object_class(self.obj_type, self.classes)
-
-        try:
-            decode_object = getattr(self, func_name)
-        except:
-            decode_object = getattr(self, "default")
+        self.obj_class = obj['class'] = obj_class
 
         obj.update(decode_object())
-        return obj
+        return make_object_record(func_name, obj)
 
     '''
     -------------------------------------------------------------
@@ -1323,7 +1366,7 @@ class DWGObject:
     def decode_handle_reference(self, base, code):
         """Decode the handle reference
 
-        @return     Parsing results (Dict.)
+        @return     Parsing results (DWGHandle)
 
                     code
                     counter
@@ -1351,7 +1394,7 @@ class DWGObject:
                 h.get('code'),
                 self.obj_name, self.obj_class
             )
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.CORRUPTED, -1, -1, msg))
 
         return h
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGPageCache - LRU cache of decompressed data pages with a byte budget
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+import threading
+from collections import OrderedDict
+from .dwg_common import *
+
+
+PAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024     # the default budget of a page cache
+
+
+class DWGPageCache:
+    """DWGPageCache class
+
+        Keeps decompressed data pages, keyed by (namespace, page id), while their total size
+        stays within max_bytes; the least recently used pages are evicted first.
+        A namespace tells files apart, so one cache can be shared by the parsers of a
+        long-lived process (pass it as DWGParser(..., page_cache=cache)).
+        Reads and updates are serialized by a lock.
+    """
+
+    def __init__(self, max_bytes=PAGE_CACHE_MAX_BYTES):
+        """The constructor
+
+        Args:
+            max_bytes (int): The budget of cached pages in bytes (0 disables caching)
+        """
+        self.max_bytes = max(0, max_bytes)
+        self.pages = OrderedDict()  # (namespace, page id) -> (value, size), the most recently used last
+        self.bytes = 0
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.lock = threading.Lock()
+        return
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, key):
+        return key in self.pages
+
+    def get(self, key):
+        """Get a cached page (counted as a hit or a miss)
+
+        Args:
+            key (tuple): (namespace, page id)
+
+        Returns:
+            Cached value or None
+        """
+        with self.lock:
+            item = self.pages.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.pages.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, size):
+        """Add a page and evict the least recently used ones beyond the budget
+
+        Args:
+            key (tuple): (namespace, page id)
+            value: The page (e.g. decompressed data)
+            size (int): The page size in bytes (counted against the budget)
+
+        Returns:
+            True or False (if the page alone exceeds the budget)
+        """
+        if self.max_bytes < size:
+            return False
+
+        with self.lock:
+            item = self.pages.pop(key, None)
+            if item is not None:
+                self.bytes -= item[1]
+
+            self.pages[key] = (value, size)
+            self.bytes += size
+
+            while self.max_bytes < self.bytes:
+                _, (_, evicted) = self.pages.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return True
+
+    def resize(self, max_bytes):
+        """Change the budget (evicting pages if needed)
+        """
+        with self.lock:
+            self.max_bytes = max(0, max_bytes)
+            while self.max_bytes < self.bytes:
+                _, (_, evicted) = self.pages.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return
+
+    def clear(self, namespace=None):
+        """Drop cached pages
+
+        Args:
+            namespace: Drop the pages of this namespace only (default: all pages)
+        """
+        with self.lock:
+            if namespace is None:
+                self.pages.clear()
+                self.bytes = 0
+                return
+
+            for key in [key for key in self.pages if key[0] == namespace]:
+                self.bytes -= self.pages.pop(key)[1]
+        return
+
+    def stats(self):
+        """Get the statistics
+
+        Returns:
+            dict {pages, bytes, max_bytes, hits, misses, evictions}
+        """
+        with self.lock:
+            return {'pages':     len(self.pages),
+                    'bytes':     self.bytes,
+                    'max_bytes': self.max_bytes,
+                    'hits':      self.hits,
+                    'misses':    self.misses,
+                    'evictions': self.evictions}
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGPageMap - column-oriented storage of page map entries
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+from array import array
+from collections.abc import Mapping
+from .dwg_common import *
+
+
+class DWGPageMap:
+    """DWGPageMap class
+
+        Keeps page ids, sizes and addresses in parallel array('q') columns
+        (24 bytes per page instead of a dict per page).
+        Behaves like the former list of entries: len(), indexing and iteration
+        return entry dicts {'id', 'size', 'address'}, built when requested.
+    """
+
+    def __init__(self):
+        """The constructor"""
+        self.ids = array('q')
+        self.sizes = array('q')
+        self.addresses = array('q')
+        self.rows = None    # page id -> row (built on the first lookup)
+        return
+
+    def append(self, id, size, address):
+        self.ids.append(id)
+        self.sizes.append(size)
+        self.addresses.append(address)
+        self.rows = None
+        return
+
+    def entry(self, row):
+        """Build the entry dict of a row
+        """
+        return {'id':      self.ids[row],
+                'size':    self.sizes[row],
+                'address': self.addresses[row]}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.entry(row) for row in range(*key.indices(len(self.ids)))]
+        if key < 0:
+            key += len(self.ids)
+        if key < 0 or len(self.ids) <= key:
+            raise IndexError("page map index out of range")
+        return self.entry(key)
+
+    def __iter__(self):
+        for row in range(len(self.ids)):
+            yield self.entry(row)
+
+    def find_row(self, id):
+        """Find the row of a page id (the first one if the id is duplicated)
+
+        Returns:
+            Row (int) or None
+        """
+        if self.rows is None:
+            self.rows = {}
+            for row, value in enumerate(self.ids):
+                self.rows.setdefault(value, row)
+        return self.rows.get(id)
+
+    def find(self, id):
+        """Find the entry of a page id
+
+        Returns:
+            Entry (dict) or None
+        """
+        row = self.find_row(id)
+        if row is None:
+            return None
+        return self.entry(row)
+
+    def index(self):
+        """Get a read-only page id -> entry mapping over this page map
+        """
+        return DWGPageIndex(self)
+
+
+class DWGPageIndex(Mapping):
+    """DWGPageIndex class
+
+        Page id -> entry mapping backed by a DWGPageMap (entries are built when requested).
+    """
+
+    def __init__(self, page_map):
+        self.page_map = page_map
+        return
+
+    def __getitem__(self, id):
+        entry = self.page_map.find(id)
+        if entry is None:
+            raise KeyError(id)
+        return entry
+
+    def get(self, id, default=None):
+        entry = self.page_map.find(id)
+        return default if entry is None else entry
+
+    def __contains__(self, id):
+        return self.page_map.find_row(id) is not None
+
+    def __iter__(self):
+        self.page_map.find_row(None)
+        return iter(self.page_map.rows)
+
+    def __len__(self):
+        self.page_map.find_row(None)
+        return len(self.page_map.rows)
@@ -16,14 +16,17 @@
 """
 
 import os.path
+import mmap
 from decorator import decorator
 import ntpath
 import logging
 logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)-22s %(name)-25s %(levelname)-8s %(message)s',
+                    format='%(asctime)-22s %(name)-25s %(levelname)-8s %(funcName)s(): %(message)s',
                     datefmt='%Y-%m-%d %H:%M:%S')
 
 from .dwg_common import *
+from .dwg_file_buffer import DWGFileBuffer
+from .dwg_page_cache import DWGPageCache
 from .dwg_format_base import DWGFormatBase
 from .dwg_format_r18 import DWGFormatR18
 from .dwg_format_r21 import DWGFormatR21
@@ -34,7 +37,7 @@ def check_status(func, *args, **kwargs):
     """Decorator for checking the current status
     """
     if args[0].file_size == 0 or args[0].file_buf is None:
-        args[0].logger.debug("{}(): File loading failed.".format(GET_MY_NAME()))
+        args[0].logger.debug("File loading failed.")
         return False
     return func(*args, **kwargs)
 
@@ -43,26 +46,115 @@ class DWGParser:
     """DWGParser class
     """
 
-    def __init__(self, path, mode=DWGParsingMode.FULL):
-        """The constructor"""
+    def __init__(self, path=None, mode=DWGParsingMode.FULL, loading=DWGLoadingMode.MEMORY,
+                 rs_correction=False, page_cache=None):
+        """The constructor
+
+        Args:
+            path (str): The path of a DWG file
+                        (None when the data is given by from_bytes() or from_fileobj())
+            mode (DWGParsingMode)
+            loading (DWGLoadingMode): MEMORY (read the whole file),
+                                      MMAP (map the file and share it as a memoryview) or
+                                      STREAM (read only the pages requested, e.g. for METADATA mode)
+            rs_correction (bool): Correct damaged R21 pages using Reed-Solomon parity bytes
+                                  (corrected and uncorrectable blocks are added to the report)
+            page_cache (DWGPageCache): A cache of decompressed data pages to share with other parsers
+                                       (default: a new cache for this parser; DWGPageCache(0) disables caching)
+        """
         self.file_path = path
-        self.file_name = ntpath.basename(path)
+        self.file_name = ntpath.basename(path) if path is not None else ""
 
         self.file_buf = None
         self.file_size = 0
+        self.file_mmap = None
+        self.file_obj = None
         self.dwg_version = DWGVersion.UNSUPPORTED
         self.fm = DWGFormatBase()
         self.parsing_mode = mode
+        self.loading_mode = loading
+        self.rs_correction = rs_correction
+        self.page_cache = page_cache if page_cache is not None else DWGPageCache()
+        self.page_cache_namespace = object()    # pages of in-memory data are not shared
 
         self.logger = logging.getLogger(__name__)
 
+        if path is None:
+            return
+
         # open and read a dwg file
-        self.file_size = os.path.getsize(path)
+        stat = os.stat(path)
+        self.file_size = stat.st_size
+
+        # pages of an unchanged file are shared by its parsers (with the same RS correction setting)
+        self.page_cache_namespace = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, rs_correction)
         f = open(path, 'rb')
-        self.file_buf = f.read()
+        if loading == DWGLoadingMode.STREAM:
+            # the file stays open until close()
+            self.file_obj = f
+            self.file_buf = DWGFileBuffer(f, 0, self.file_size)
+            return
+
+        if loading == DWGLoadingMode.MMAP and self.file_size > 0:
+            # slices of a memoryview share the mapped pages instead of copying them
+            self.file_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.file_buf = memoryview(self.file_mmap)
+        else:
+            self.file_buf = f.read()
         f.close()
         return
 
+    @classmethod
+    def from_bytes(cls, buf, name="", mode=DWGParsingMode.FULL, rs_correction=False, page_cache=None):
+        """Create a parser for DWG data already in memory
+
+        Args:
+            buf (bytes, bytearray or memoryview): DWG data
+            name (str): The name used in logs and reports
+            mode (DWGParsingMode)
+            rs_correction (bool)
+            page_cache (DWGPageCache)
+
+        Returns:
+            DWGParser
+        """
+        parser = cls(None, mode, rs_correction=rs_correction, page_cache=page_cache)
+        parser.file_name = name
+        parser.file_buf = buf
+        parser.file_size = len(buf)
+        return parser
+
+    @classmethod
+    def from_fileobj(cls, fp, name=None, mode=DWGParsingMode.FULL, rs_correction=False, page_cache=None):
+        """Create a parser for DWG data in a binary file-like object
+
+            A seekable stream is not read in advance; format modules get a DWGFileBuffer
+            which reads only the byte ranges they ask for, starting at the current position.
+            A non-seekable stream is read up to the end.
+            The stream stays open and owned by the caller.
+
+        Args:
+            fp (file-like object): A binary stream (zip member, image file, socket, ...)
+            name (str): The name used in logs and reports (default: fp.name if exists)
+            mode (DWGParsingMode)
+            rs_correction (bool)
+            page_cache (DWGPageCache)
+
+        Returns:
+            DWGParser
+        """
+        if name is None:
+            name = getattr(fp, 'name', "")
+            name = ntpath.basename(name) if isinstance(name, str) else ""
+
+        seekable = getattr(fp, 'seekable', None)
+        if seekable is not None and seekable():
+            buf = DWGFileBuffer(fp)
+        else:
+            buf = fp.read()
+
+        return cls.from_bytes(buf, name, mode, rs_correction, page_cache)
+
     @check_status
     def parse(self):
         """Parse a DWG file
@@ -70,13 +162,13 @@ class DWGParser:
         Returns:
             True or False
         """
-        self.logger.info("{}(): Start parsing a file {}".format(GET_MY_NAME(), self.file_name))
+        self.logger.info("Start parsing a file %s", self.file_name)
 
         # get DWG version signature
         self.check_signature()
 
         if not (DWGVersion.R18 <= self.dwg_version <= DWGVersion.R21):
-            self.logger.info("{}(): The current version supports R18 and R21 only.".format(GET_MY_NAME()))
+            self.logger.info("The current version supports R18 and R21 only.")
             return False
 
         # create a format module
@@ -93,6 +185,27 @@ class DWGParser:
 
         """
         self.fm.close()
+
+        if not isinstance(self.page_cache_namespace, tuple):
+            # nobody can look up the pages of in-memory data again
+            self.page_cache.clear(self.page_cache_namespace)
+
+        if isinstance(self.file_buf, DWGFileBuffer):
+            self.file_buf.close()
+
+        if self.file_obj is not None:
+            self.file_obj.close()
+            self.file_obj = None
+
+        if self.file_mmap is not None:
+            self.file_buf.release()
+            try:
+                self.file_mmap.close()
+            except BufferError:
+                # views exported to the caller are still alive; the mapping is freed with them
+                pass
+            self.file_mmap = None
+        self.file_buf = None
         return
 
     def get_result(self):
@@ -104,7 +217,7 @@ class DWGParser:
     def check_signature(self):
         """Check DWG signature to get the version info.
         """
-        signature = self.file_buf[0:6].decode("utf-8")
+        signature = bytes(self.file_buf[0:6]).decode("utf-8")
 
         if signature == 'AC1012':
             self.dwg_version = DWGVersion.R13
@@ -123,7 +236,7 @@ class DWGParser:
         else:
             self.dwg_version = DWGVersion.UNSUPPORTED
 
-        self.logger.info("{}(): DWG version is {}".format(GET_MY_NAME(), self.dwg_version.name))
+        self.logger.info("DWG version is %s", self.dwg_version.name)
         return
 
     def create_format_module(self, version):
@@ -137,6 +250,9 @@ class DWGParser:
         """
         module_name = 'DWGFormat' + version
         module = globals()[module_name](self.file_buf, self.file_size, self.file_name, self.parsing_mode)
-        self.logger.info("{}(): {}".format(GET_MY_NAME(), module_name))
+        module.rs_correction = self.rs_correction
+        module.page_cache = self.page_cache
+        module.page_cache_namespace = self.page_cache_namespace
+        self.logger.info("%s", module_name)
         return module
 
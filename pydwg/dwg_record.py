@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGRecord - compact (__slots__) records for handles and decoded objects
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+import keyword
+from .dwg_common import *
+
+
+class DWGRecord:
+    """DWGRecord class
+
+        Base of __slots__ records with dict-style access (r['key'], r.get(), 'key' in r, items() ...).
+        A slot without a value behaves like a missing key.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (DWGRecord, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, DWGRecord) else other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return dict(self.items())
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            self[key] = value
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self.to_dict())
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def values(self):
+        return [getattr(self, key) for key in self.keys()]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self):
+        """Convert to a dict (records in values and lists are converted as well)
+        """
+        return {key: record_to_dict(value) for key, value in self.items()}
+
+
+def record_to_dict(value):
+    """Convert records in a value (record, list or dict) to dicts
+    """
+    if isinstance(value, DWGRecord):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [record_to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return {key: record_to_dict(item) for key, item in value.items()}
+    return value
+
+
+class DWGHandle(DWGRecord):
+    """DWGHandle class
+
+        A handle reference (absolute_reference is set by DWGObject.decode_handle_reference()).
+    """
+
+    __slots__ = ('code', 'counter', 'value', 'absolute_reference')
+
+    def __init__(self, code, counter, value=0):
+        self.code = code
+        self.counter = counter
+        self.value = value
+        return
+
+
+class DWGObjectEntry(DWGRecord):
+    """DWGObjectEntry class
+
+        An entry of the decoded object list (location in AcDb:AcDbObjects & the decoded body).
+        handle_stream_size is set for R24+ only.
+    """
+
+    __slots__ = ('handle_from_object_map', 'offset', 'size', 'handle_stream_size', 'body', 'type')
+
+
+class DWGObjectRecord(DWGRecord):
+    """DWGObjectRecord class
+
+        Base of decoded object records. Record classes are made per object type and field layout
+        (fields depend on flags), and cached in OBJECT_RECORD_CLASSES.
+        Keys added after decoding are kept in a small dict.
+        Records are pickled by type name and fields (the classes are made at runtime).
+    """
+
+    __slots__ = ('_extra',)
+    type_name = None
+    fields = ()
+    setters = ()
+
+    def __reduce__(self):
+        fields = {key: getattr(self, key) for key in self.fields if hasattr(self, key)}
+        return make_object_record, (self.type_name, fields), getattr(self, '_extra', None)
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        try:
+            return self._extra[key]
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.fields:
+            setattr(self, key, value)
+            return
+        if not hasattr(self, '_extra'):
+            self._extra = {}
+        self._extra[key] = value
+
+    def __contains__(self, key):
+        if key in self.fields:
+            return hasattr(self, key)
+        return key in getattr(self, '_extra', ())
+
+    def get(self, key, default=None):
+        if key in self.fields:
+            return getattr(self, key, default)
+        return getattr(self, '_extra', {}).get(key, default)
+
+    def keys(self):
+        keys = [key for key in self.fields if hasattr(self, key)]
+        keys.extend(getattr(self, '_extra', ()))
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+
+OBJECT_RECORD_CLASSES = {}   # (name, fields) -> class
+
+
+def make_object_record(name, fields):
+    """Make a record of a decoded object
+
+    Args:
+        name (str): The object type name (e.g. LINE)
+        fields (dict): Decoded fields
+
+    Returns:
+        DWGObjectRecord (or fields itself if a key cannot be a slot name)
+    """
+    keys = tuple(fields)
+    cls = OBJECT_RECORD_CLASSES.get((name, keys))
+    if cls is None:
+        for key in keys:
+            if not key.isidentifier() or keyword.iskeyword(key) or hasattr(DWGObjectRecord, key):
+                return fields
+        cls = type("DWGObjectRecord_" + name, (DWGObjectRecord,),
+                   {'__slots__': keys, 'type_name': name, 'fields': keys})
+        cls.setters = tuple(getattr(cls, key).__set__ for key in keys)
+        OBJECT_RECORD_CLASSES[(name, keys)] = cls
+
+    record = cls.__new__(cls)
+    for setter, value in zip(cls.setters, fields.values()):
+        setter(record, value)
+    return record
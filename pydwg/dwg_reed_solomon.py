@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGReedSolomon - Reed-Solomon error correction for R21 pages
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+import logging
+from .dwg_common import *
+
+
+RS_CODEWORD_SIZE = 255      # n (bytes per codeword)
+RS_PRIMITIVE_POLY = 0x11D   # x^8 + x^4 + x^3 + x^2 + 1
+RS_FIRST_ROOT = 1           # the generator polynomial has roots alpha^1 ... alpha^(n-k)
+
+
+def build_gf_tables():
+    """Build log/antilog tables of GF(256)
+
+    Returns:
+        exp (list): alpha^i for i in 0...509 (doubled to skip the modulo in multiplication)
+        log (list): log_alpha(x) for x in 1...255
+    """
+    exp = [0] * 510
+    log = [0] * 256
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= RS_PRIMITIVE_POLY
+    for i in range(255, 510):
+        exp[i] = exp[i - 255]
+    return exp, log
+
+
+GF_EXP, GF_LOG = build_gf_tables()
+
+# GF_MUL_TABLES[e] maps every byte x to x * alpha^e (for bytes.translate)
+GF_MUL_TABLES = [bytes([GF_EXP[GF_LOG[x] + e] if x else 0 for x in range(256)]) for e in range(255)]
+
+
+def gf_mul(a, b):
+    if a == 0 or b == 0:
+        return 0
+    return GF_EXP[GF_LOG[a] + GF_LOG[b]]
+
+
+def gf_div(a, b):
+    if a == 0:
+        return 0
+    return GF_EXP[(GF_LOG[a] - GF_LOG[b]) % 255]
+
+
+def gf_poly_eval(poly, x):
+    """Evaluate a polynomial (lowest degree first) at x
+    """
+    value = 0
+    for coef in reversed(poly):
+        value = gf_mul(value, x) ^ coef
+    return value
+
+
+class DWGReedSolomon:
+    """DWGReedSolomon class
+
+        Corrects interleaved RS(255,k) codewords of R21 pages
+        (k = 239 for system pages, 251 for data pages).
+        In a codeword the k data bytes come first (the highest degree) and the parity bytes last.
+
+        Syndromes are computed for all codewords of a page at once: position 'i' of every codeword
+        is one contiguous run of the interleaved page, so each term is one bytes.translate()
+        of that run, and terms are added (XORed) as big integers.
+        A clean page costs (n-k) * 255 of these steps, whatever the page size.
+    """
+
+    def __init__(self, k):
+        """The constructor
+
+        Args:
+            k (int): The number of data bytes per codeword
+        """
+        self.k = k
+        self.nsym = RS_CODEWORD_SIZE - k
+
+        # global logger
+        self.logger = logging.getLogger(__name__)
+        return
+
+    def correct_interleaved(self, src_buf, block_count):
+        """Correct errors of interleaved codewords
+
+        Args:
+            src_buf (bytes): RS-encoded data (codeword 'b' is every block_count-th byte from b)
+            block_count (int): The number of codewords
+
+        Returns:
+            data (bytes): Corrected data (or src_buf itself if clean)
+            corrected (list): Indexes of corrected codewords
+            uncorrectable (list): Indexes of uncorrectable codewords
+        """
+        corrected = []
+        uncorrectable = []
+
+        size = RS_CODEWORD_SIZE * block_count
+        if block_count <= 0 or len(src_buf) < size:
+            self.logger.debug("Not enough data for %d codewords.", block_count)
+            return src_buf, corrected, uncorrectable
+
+        syndromes = self.calculate_syndromes(src_buf, block_count)
+        if not any(syndromes):
+            return src_buf, corrected, uncorrectable
+
+        data = bytearray(src_buf)
+        rows = [value.to_bytes(block_count, 'little') for value in syndromes]
+        for idx in range(block_count):
+            s = [row[idx] for row in rows]
+            if not any(s):
+                continue
+
+            codeword = list(data[idx:size:block_count])
+            if self.correct_codeword(codeword, s) is False:
+                uncorrectable.append(idx)
+                continue
+
+            data[idx:size:block_count] = bytes(codeword)
+            corrected.append(idx)
+
+        return bytes(data), corrected, uncorrectable
+
+    def calculate_syndromes(self, src_buf, block_count):
+        """Calculate syndromes of all interleaved codewords
+
+        Args:
+            src_buf (bytes): RS-encoded data
+            block_count (int): The number of codewords
+
+        Returns:
+            List of syndromes (int) for alpha^(RS_FIRST_ROOT+j), j = 0 ... n-k-1
+            (byte 'b' in little endian is the syndrome of codeword 'b')
+        """
+        rows = [bytes(src_buf[i*block_count:(i+1)*block_count]) for i in range(RS_CODEWORD_SIZE)]
+        rows = [(RS_CODEWORD_SIZE - 1 - i, row) for i, row in enumerate(rows) if any(row)]
+
+        syndromes = []
+        for j in range(self.nsym):
+            root = RS_FIRST_ROOT + j
+            value = 0
+            for degree, row in rows:
+                value ^= int.from_bytes(row.translate(GF_MUL_TABLES[(root * degree) % 255]), 'little')
+            syndromes.append(value)
+        return syndromes
+
+    def calculate_codeword_syndromes(self, codeword):
+        """Calculate syndromes of a codeword (list of int, the highest degree first)
+        """
+        syndromes = []
+        for j in range(self.nsym):
+            root = GF_EXP[RS_FIRST_ROOT + j]
+            value = 0
+            for coef in codeword:
+                value = gf_mul(value, root) ^ coef
+            syndromes.append(value)
+        return syndromes
+
+    def correct_codeword(self, codeword, syndromes):
+        """Correct a codeword in place (Berlekamp-Massey, Chien search and Forney algorithm)
+
+        Args:
+            codeword (list): 255 bytes (int), the highest degree first
+            syndromes (list): Syndromes of the codeword
+
+        Returns:
+            The number of corrected bytes (int) or False (if uncorrectable)
+        """
+        # error locator polynomial (lowest degree first)
+        locator = self.find_error_locator(syndromes)
+        errors = len(locator) - 1
+        if errors == 0 or errors * 2 > self.nsym:
+            return False
+
+        # error positions (as degrees)
+        degrees = []
+        for degree in range(RS_CODEWORD_SIZE):
+            if gf_poly_eval(locator, GF_EXP[(255 - degree) % 255]) == 0:
+                degrees.append(degree)
+        if len(degrees) != errors:
+            return False
+
+        # error evaluator polynomial: S(x) * locator(x) mod x^(n-k)
+        evaluator = [0] * self.nsym
+        for i, s in enumerate(syndromes):
+            for j, coef in enumerate(locator):
+                if i + j < self.nsym:
+                    evaluator[i + j] ^= gf_mul(s, coef)
+
+        # formal derivative of the locator (only odd terms remain in GF(2^m))
+        derivative = [locator[i] if i % 2 else 0 for i in range(1, len(locator))]
+
+        for degree in degrees:
+            x_inv = GF_EXP[(255 - degree) % 255]
+            denominator = gf_poly_eval(derivative, x_inv)
+            if denominator == 0:
+                return False
+            magnitude = gf_div(gf_poly_eval(evaluator, x_inv), denominator)
+            magnitude = gf_mul(magnitude, GF_EXP[(degree * (1 - RS_FIRST_ROOT)) % 255])
+            codeword[RS_CODEWORD_SIZE - 1 - degree] ^= magnitude
+
+        if any(self.calculate_codeword_syndromes(codeword)):
+            return False
+        return errors
+
+    def find_error_locator(self, syndromes):
+        """Find the error locator polynomial (Berlekamp-Massey algorithm)
+
+        Returns:
+            Error locator polynomial (list of int, lowest degree first)
+        """
+        locator = [1]
+        prev = [1]
+        length = 0
+        shift = 1
+        prev_discrepancy = 1
+
+        for r in range(self.nsym):
+            discrepancy = syndromes[r]
+            for i in range(1, length + 1):
+                discrepancy ^= gf_mul(locator[i], syndromes[r - i])
+
+            if discrepancy == 0:
+                shift += 1
+                continue
+
+            coef = gf_div(discrepancy, prev_discrepancy)
+            updated = locator + [0] * max(0, len(prev) + shift - len(locator))
+            for i, value in enumerate(prev):
+                updated[i + shift] ^= gf_mul(coef, value)
+
+            if 2 * length <= r:
+                prev = locator
+                length = r + 1 - length
+                prev_discrepancy = discrepancy
+                shift = 1
+            else:
+                shift += 1
+            locator = updated
+
+        # drop the trailing zero coefficients
+        while len(locator) > 1 and locator[-1] == 0:
+            locator.pop()
+        return locator
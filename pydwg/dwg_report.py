@@ -20,6 +20,7 @@ class DWGVType(Enum):
     UNUSED_AREA     = "Unused area"
     INVALID_CRC     = "Invalid CRC value"
     CORRUPTED       = "Corrupted data"
+    CORRECTED       = "Corrected data"
 
 
 class DWGVInfo:
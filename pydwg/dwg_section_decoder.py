@@ -24,6 +24,10 @@ from .dwg_utils import *
 from .dwg_bit_codes import *
 from .dwg_report import *
 from .dwg_object import *
+from .dwg_record import DWGObjectEntry
+
+
+OBJECT_HEAD_SIZE = 16   # enough for MS size (4 bytes) + MC handle stream size (5 bytes) + BS type (3 bytes)
 
 
 class DWGSectionDecoder:
@@ -58,13 +62,13 @@ class DWGSectionDecoder:
                                      affects_graphics (bool), reference_count (int) }
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = OrderedDict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -103,7 +107,7 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
@@ -124,13 +128,13 @@ class DWGSectionDecoder:
                 wmf     (if it is present)
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = dict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -138,7 +142,7 @@ class DWGSectionDecoder:
         sn = bc.read_sn()
         if DWG_SENTINEL_PREVIEW_BEFORE != sn:
             msg = "[{}] DWG_SENTINEL_PREVIEW_BEFORE mis-match.".format(DWGSectionName.PREVIEW.value)
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, 0, len(sn), msg))
             return decoded
 
@@ -173,7 +177,7 @@ class DWGSectionDecoder:
         sn = bc.read_sn()
         if DWG_SENTINEL_PREVIEW_AFTER != sn:
             msg = "[{}] DWG_SENTINEL_PREVIEW_AFTER mis-match.".format(DWGSectionName.PREVIEW.value)
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, bc.pos_byte-len(sn), len(sn), msg))
 
         # Check slack areas
@@ -182,7 +186,7 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
@@ -207,13 +211,13 @@ class DWGSectionDecoder:
                 app_info_version
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = OrderedDict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -258,7 +262,7 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
@@ -284,13 +288,13 @@ class DWGSectionDecoder:
                 product (XML format)
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = OrderedDict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -325,7 +329,7 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
@@ -430,14 +434,14 @@ class DWGSectionDecoder:
                 CUSTOM_NAMES (if it is present)
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = OrderedDict()
         unicode = True if encoding == DWGEncoding.UTF16LE.value else False
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -477,78 +481,150 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
 
-    def objects(self, section, object_map):
+    def objects(self, section, object_map, check_crc=True, types=None):
         """Decode all objects
 
         Args:
             section (dict): section dictionary {'header', 'data'}
             object_map (list): list of dict {'handle', 'offset'}
+            check_crc (bool): Verify the CRC of each object (MS size + object data, seed: 0xC0C1)
+            types (iterable): Object types to decode (see DWGObject.get_type_codes), None for all
 
         Returns:
-            list of decoded objects
+            list of decoded objects (DWGObjectEntry)
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
+
+        objects = list(self.iter_objects(section, object_map, check_crc, types))
+
+        self.logger.info("%d objects are decoded.", len(objects))
+        return objects
+
+    def iter_objects(self, section, object_map, check_crc=True, types=None):
+        """Decode objects one by one in object map order
 
-        objects = []
+            Nothing is kept after an object is yielded, so consumers can stream
+            any number of objects in constant memory.
 
+        Args:
+            section (dict): section dictionary {'header', 'data'}
+            object_map (list): list of dict {'handle', 'offset'}
+            check_crc (bool): Verify the CRC of each object
+            types (iterable): Object types to decode (see DWGObject.get_type_codes), None for all
+
+        Yields:
+            Decoded object (DWGObjectEntry); undecodable objects are skipped
+        """
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
-            return objects
+            self.logger.debug("Data is empty.")
+            return
 
-        bc = DWGBitCodes(data, len(data))
+        type_codes = self.object.get_type_codes(types) if types is not None else None
 
         for item in object_map:
-            handle = item.get('handle')
-            offset = item.get('offset')
-            bc.set_pos(offset)
-
-            obj = dict()
-            obj['handle_from_object_map'] = handle
-            obj['offset'] = offset
-
-            size = bc.read_ms()  # size in bytes excluding 2 bytes (crc)
-            if size <= 0 or len(data) <= size + 2:
-                self.logger.debug("{}(): Object's size is invalid.".format(GET_MY_NAME()))
-                msg = "[{}] Object's size is invalid.".format(DWGSectionName.ACDBOBJECTS.value)
-                self.report.add(DWGVInfo(DWGVType.CORRUPTED, offset, -1, msg))
-                continue
-
-            plus = bc.pos_byte - offset
-            size += 2  # 2 bytes for CRC
-            obj['size'] = plus+size
-
-            # self.utils.print_hex_bytes(bc.buf[offset:offset+size], size)
-
-            if DWGVersion.R24 <= self.dwg_version:
-                obj['handle_stream_size'] = bc.read_mc()  # size in bits
-
-            obj['body'] = self.object.decode(buf=data[bc.pos_byte:bc.pos_byte+size],
-                                             pos_bit=bc.pos_bit,
-                                             size=size)
-            if obj.get('body') is None:
-                self.logger.debug("{}(): Unknown object.".format(GET_MY_NAME()))
-                msg = "[{}] Unknown object.".format(DWGSectionName.ACDBOBJECTS.value)
-                self.report.add(DWGVInfo(DWGVType.UNKNOWN_OBJECT, offset, size, msg))
-                continue
-
-            if obj.get('body').get('handle') is None:
-                self.logger.debug("{}(): Object cannot be decoded.".format(GET_MY_NAME()))
-                msg = "[{}] Object cannot be parsed.".format(DWGSectionName.ACDBOBJECTS.value)
-                self.report.add(DWGVInfo(DWGVType.CORRUPTED, offset, size, msg))
-                continue
-
-            obj['type'] = obj.get('body').get('type')
-            objects.append(obj)
-            # self.utils.print_dict(obj)
-
-        self.logger.info("{}(): {} objects are decoded.".format(GET_MY_NAME(), len(objects)))
-        return objects
+            obj = self.object_at(data, item.get('handle'), item.get('offset'), check_crc, type_codes)
+            if obj is not None:
+                yield obj
+                del obj
+
+    def object_at(self, data, handle, offset, check_crc=True, type_codes=None):
+        """Decode an object at an offset of AcDb:AcDbObjects
+
+            Only the bytes of the object are sliced from data, so data can be
+            a paged view (DWGSectionPages) as well as bytes.
+
+        Args:
+            data (bytes): AcDb:AcDbObjects data stream
+            handle (int): The handle from the object map
+            offset (int): The offset from the object map
+            check_crc (bool): Verify the CRC of the object
+            type_codes (set): Type codes to decode, None for all
+                              (other objects are skipped after reading just the size and the type)
+
+        Returns:
+            Decoded object (DWGObjectEntry) or None
+        """
+        head = data[offset:offset+OBJECT_HEAD_SIZE]
+        bc = DWGBitCodes(head, len(head))
+
+        obj = DWGObjectEntry()
+        obj['handle_from_object_map'] = handle
+        obj['offset'] = offset
+
+        size = bc.read_ms()  # size in bytes excluding 2 bytes (crc)
+        if size <= 0 or len(data) <= size + 2:
+            self.logger.debug("Object's size is invalid.")
+            msg = "[{}] Object's size is invalid.".format(DWGSectionName.ACDBOBJECTS.value)
+            self.report.add(DWGVInfo(DWGVType.CORRUPTED, offset, -1, msg))
+            return None
+
+        plus = bc.pos_byte
+        size += 2  # 2 bytes for CRC
+        obj['size'] = plus+size
+
+        if DWGVersion.R24 <= self.dwg_version:
+            handle_stream_size = bc.read_mc()  # size in bits
+        else:
+            handle_stream_size = None
+
+        if type_codes is not None:
+            pos_byte, pos_bit = bc.pos_byte, bc.pos_bit
+            if bc.read_bs() not in type_codes:
+                return None
+            bc.set_pos(pos_byte, pos_bit)
+
+        if check_crc is True:
+            self.check_object_crc(data, offset, plus+size)
+
+        # self.utils.print_hex_bytes(bc.buf[offset:offset+size], size)
+
+        if handle_stream_size is not None:
+            obj['handle_stream_size'] = handle_stream_size
+
+        start = offset + bc.pos_byte
+        obj['body'] = self.object.decode(buf=data[start:start+size],
+                                         pos_bit=bc.pos_bit,
+                                         size=size)
+        if obj.get('body') is None:
+            self.logger.debug("Unknown object.")
+            msg = "[{}] Unknown object.".format(DWGSectionName.ACDBOBJECTS.value)
+            self.report.add(DWGVInfo(DWGVType.UNKNOWN_OBJECT, offset, size, msg))
+            return None
+
+        if obj.get('body').get('handle') is None:
+            self.logger.debug("Object cannot be decoded.")
+            msg = "[{}] Object cannot be parsed.".format(DWGSectionName.ACDBOBJECTS.value)
+            self.report.add(DWGVInfo(DWGVType.CORRUPTED, offset, size, msg))
+            return None
+
+        obj['type'] = obj.get('body').get('type')
+        return obj
+
+    def check_object_crc(self, data, offset, size):
+        """Check the CRC of an object and report a mismatch
+
+        Args:
+            data (bytes): AcDb:AcDbObjects data stream
+            offset (int): The offset of the object (at the MS size)
+            size (int): The object size including the MS size and the CRC
+
+        Returns:
+            True or False
+        """
+        end = offset + size
+        saved_crc = int.from_bytes(data[end-2:end], 'little')
+        if self.utils.check_crc8(data[offset:end-2], 0xC0C1, saved_crc) is False:
+            msg = "[{}] Object's CRC mis-matches.".format(DWGSectionName.ACDBOBJECTS.value)
+            self.logger.debug(msg)
+            self.report.add(DWGVInfo(DWGVType.INVALID_CRC, offset, size, msg))
+            return False
+        return True
 
     def header(self, section):
         """Decode header variables from the 'AcDb:Classes' section
@@ -568,13 +644,13 @@ class DWGSectionDecoder:
                 -------------------------
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = dict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -582,7 +658,7 @@ class DWGSectionDecoder:
         sn = bc.read_sn()
         if DWG_SENTINEL_HEADER_BEFORE != sn:
             msg = "[{}] DWG_SENTINEL_HEADER_BEFORE mis-match.".format(DWGSectionName.HEADER.value)
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, 0, len(sn), msg))
             return decoded
 
@@ -985,7 +1061,7 @@ class DWGSectionDecoder:
         sn = bc.read_sn()
         if DWG_SENTINEL_HEADER_AFTER != sn:
             msg = "[{}] DWG_SENTINEL_HEADER_AFTER mis-match.".format(DWGSectionName.HEADER.value)
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, bc.pos_byte-len(sn), len(sn), msg))
 
         # Check CRC value
@@ -1007,13 +1083,13 @@ class DWGSectionDecoder:
         Returns:
             list of decoded classes
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = dict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -1021,7 +1097,7 @@ class DWGSectionDecoder:
         sn = bc.read_sn()
         if DWG_SENTINEL_CLASSES_BEFORE != sn:
             msg = "[{}] DWG_SENTINEL_CLASSES_BEFORE mis-match.".format(DWGSectionName.CLASSES.value)
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, 0, len(sn), msg))
             return decoded
 
@@ -1126,7 +1202,7 @@ class DWGSectionDecoder:
         sn = bc.read_sn()
         if DWG_SENTINEL_CLASSES_AFTER != sn:
             msg = "[{}] DWG_SENTINEL_CLASSES_AFTER mis-match.".format(DWGSectionName.CLASSES.value)
-            self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+            self.logger.debug(msg)
             self.report.add(DWGVInfo(DWGVType.SYNTAX_ERROR, bc.pos_byte-len(sn), len(sn), msg))
 
         # Check slack areas
@@ -1135,7 +1211,7 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
@@ -1157,13 +1233,13 @@ class DWGSectionDecoder:
                                      affects_graphics (bool), reference_count (int) }
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = dict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -1189,7 +1265,7 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
@@ -1207,13 +1283,13 @@ class DWGSectionDecoder:
                 measurement_variable (int)
             }
         """
-        self.logger.info("{}(): Decode data stream.".format(GET_MY_NAME()))
+        self.logger.info("Decode data stream.")
 
         decoded = dict()
 
         data = section.get('data')
         if len(data) == 0:
-            self.logger.debug("{}(): Data is empty.".format(GET_MY_NAME()))
+            self.logger.debug("Data is empty.")
             return decoded
 
         bc = DWGBitCodes(data, len(data))
@@ -1228,24 +1304,24 @@ class DWGSectionDecoder:
         for idx in range(slack_length):
             if bc.read_rc() != 0x00:
                 msg = "[{}] Found data in slack area.".format(DWGSectionName.FILEDEPLIST.value)
-                self.logger.debug("{}(): {}".format(GET_MY_NAME(), msg))
+                self.logger.debug(msg)
                 self.report.add(DWGVInfo(DWGVType.UNUSED_AREA, slack_offset, slack_length, msg))
 
         return decoded
 
     def vbaproject(self, section):
-        self.logger.info("{}(): not yet implemented.".format(GET_MY_NAME()))
+        self.logger.info("not yet implemented.")
         return
 
     def revhistory(self, section):
-        self.logger.info("{}(): not yet implemented.".format(GET_MY_NAME()))
+        self.logger.info("not yet implemented.")
         return
 
     def objfreespace(self, section):
-        self.logger.info("{}(): not yet implemented.".format(GET_MY_NAME()))
+        self.logger.info("not yet implemented.")
         return
 
     def signature(self, section):
-        self.logger.info("{}(): not yet implemented.".format(GET_MY_NAME()))
+        self.logger.info("not yet implemented.")
         return
 
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        DWGSectionPages - paged (decompressed on demand) view over a data section
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Tested Environment
+        Python 3.5.1
+    * References
+        Open Design Alliance, Open Design Specification for .dwg files (v5.3)
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from .dwg_common import *
+
+
+SECTION_PAGES_CACHED = 8    # the number of decompressed pages kept by a view
+
+
+class DWGSectionPages:
+    """DWGSectionPages class
+
+        Read-only, bytes-like view over the pages of a data section (len(), indexing and slicing).
+        A page is read (+ decompressed) when a slice touches it for the first time,
+        and the most recently used pages are kept.
+        Decoding an object therefore costs the one or two pages covering it, not the whole section.
+
+        Gaps between pages (e.g. missing page entries) read as zero bytes like the fully
+        decompressed stream, and each page is padded or truncated to its size in the section map.
+    """
+
+    def __init__(self, name, size, extents, loader, cache_pages=SECTION_PAGES_CACHED):
+        """The constructor
+
+        Args:
+            name (str): The section name
+            size (int): The decompressed size of the section
+            extents (list): (offset, size, key) of each page in the decompressed section
+            loader (function): loader(key) -> decompressed page (bytes) or None
+            cache_pages (int): The number of pages kept
+        """
+        self.name = name
+        self.size = size
+        self.loader = loader
+        self.cache_pages = max(1, cache_pages)
+
+        extents = sorted(extents, key=lambda extent: extent[0])
+        self.starts = [extent[0] for extent in extents]
+        self.sizes = [extent[1] for extent in extents]
+        self.keys = [extent[2] for extent in extents]
+
+        self.pages = OrderedDict()  # row -> decompressed page (the most recently used last)
+        self.loads = 0              # the number of page reads (+ decompressions)
+        return
+
+    def __len__(self):
+        return self.size
+
+    def __bytes__(self):
+        return self.read(0, self.size)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.size)
+            if step != 1:
+                return self.read(0, self.size)[key]
+            return self.read(start, stop)
+
+        if key < 0:
+            key += self.size
+        if key < 0 or self.size <= key:
+            raise IndexError("section index out of range")
+        return self.read(key, key + 1)[0]
+
+    def find_row(self, offset):
+        """Find the row of the page covering an offset
+
+        Returns:
+            Row (int) or None
+        """
+        row = bisect_right(self.starts, offset) - 1
+        if row < 0 or self.starts[row] + self.sizes[row] <= offset:
+            return None
+        return row
+
+    def page(self, row):
+        """Get a decompressed page (from the recently used pages if kept)
+        """
+        page = self.pages.get(row)
+        if page is not None:
+            self.pages.move_to_end(row)
+            return page
+
+        size = self.sizes[row]
+        page = self.loader(self.keys[row])
+        self.loads += 1
+        if page is None:
+            page = bytes(size)
+        elif len(page) != size:
+            page = bytes(page[:size]).ljust(size, b'\x00')
+        else:
+            page = bytes(page)
+
+        self.pages[row] = page
+        if len(self.pages) > self.cache_pages:
+            self.pages.popitem(last=False)
+        return page
+
+    def read(self, start, stop):
+        """Read decompressed bytes [start, stop) of the section
+        """
+        start = max(0, start)
+        stop = min(self.size, stop)
+        if stop <= start:
+            return b''
+
+        row = self.find_row(start)
+        if row is not None and stop <= self.starts[row] + self.sizes[row]:
+            # covered by a single page
+            base = self.starts[row]
+            return self.page(row)[start-base:stop-base]
+
+        data = bytearray(stop - start)
+        row = max(0, bisect_right(self.starts, start) - 1)
+        while row < len(self.starts) and self.starts[row] < stop:
+            base = self.starts[row]
+            lo = max(start, base)
+            hi = min(stop, base + self.sizes[row])
+            if lo < hi:
+                data[lo-start:hi-start] = self.page(row)[lo-base:hi-base]
+            row += 1
+        return bytes(data)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""@package pydwg
+
+    * Description
+        Regression test of R21 decompression: the table-driven copy_compressed_chunk()
+        against the previous copy_1b ... copy_16b implementation (kept below as the reference)
+    * Author
+        Hyunji Chung  (localchung@gmail.com)
+        Jungheum Park (junghmi@gmail.com)
+    * License
+        MIT License
+    * Usage
+        python -m pytest tests  (or)  python tests/test_r21_decompress.py
+"""
+
+import io
+import os
+import sys
+import random
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pydwg.dwg_utils import DWGUtils, R21_CHUNK_ORDER
+from pydwg.dwg_report import DWGReport, DWGVType
+
+
+class ReferenceUtils(DWGUtils):
+    """DWGUtils with the previous literal run copier
+    """
+
+    def copy_compressed_chunk(self, src_buf, src_idx, length, dst_buf, dst_idx):
+        """Copy a compressed chunk
+
+        Args:
+            src_buf (bytes): Compressed data buffer
+            src_idx (int): The current index of src_buf
+            length (int): This function will read this length
+            dst_buf (bytes): Decompressed data buffer
+            dst_idx (int): The current index of dst_buf
+        """
+        def copy_1b(src_buf, src_idx, copy_idx, dst_buf, dst_idx):
+            dst_buf[dst_idx+0 : dst_idx+1] = src_buf[src_idx+copy_idx+0 : src_idx+copy_idx+1]
+            return dst_idx+1
+
+        def copy_2b(src_buf, src_idx, copy_idx, dst_buf, dst_idx):
+            # dst_buf[dst_idx+0 : dst_idx+1] = src_buf[src_idx+copy_idx+1 : src_idx+copy_idx+2]
+            # dst_buf[dst_idx+1 : dst_idx+2] = src_buf[src_idx+copy_idx+0 : src_idx+copy_idx+1]
+            dst_idx = copy_1b(src_buf, src_idx+copy_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx+copy_idx,  0, dst_buf, dst_idx)
+            return dst_idx
+
+        def copy_3b(src_buf, src_idx, copy_idx, dst_buf, dst_idx):
+            dst_idx = copy_1b(src_buf, src_idx+copy_idx,  2, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx+copy_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx+copy_idx,  0, dst_buf, dst_idx)
+            return dst_idx
+
+        def copy_4b(src_buf, src_idx, copy_idx, dst_buf, dst_idx):
+            dst_buf[dst_idx+0 : dst_idx+4] = src_buf[src_idx+copy_idx+0 : src_idx+copy_idx+4]
+            return dst_idx+4
+
+        def copy_8b(src_buf, src_idx, copy_idx, dst_buf, dst_idx):
+            dst_buf[dst_idx+0 : dst_idx+8] = src_buf[src_idx+copy_idx+0 : src_idx+copy_idx+8]
+            return dst_idx+8
+
+        def copy_16b(src_buf, src_idx, copy_idx, dst_buf, dst_idx):
+            # dst_buf[dst_idx+0 : dst_idx+8 ] = src_buf[src_idx+copy_idx+8 : src_idx+copy_idx+16]
+            # dst_buf[dst_idx+8 : dst_idx+16] = src_buf[src_idx+copy_idx+0 : src_idx+copy_idx+8 ]
+            dst_idx = copy_8b(src_buf, src_idx+copy_idx, 8, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx+copy_idx, 0, dst_buf, dst_idx)
+            return dst_idx
+
+        while 32 <= length:
+            dst_idx = copy_16b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx,  0, dst_buf, dst_idx)
+            src_idx += 32
+            length  -= 32
+
+        if length == 1:
+            copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 2:
+            dst_idx = copy_1b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+            # copy_2b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 3:
+            dst_idx = copy_1b(src_buf, src_idx,  2, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 4:
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  2, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  3, dst_buf, dst_idx)
+        elif length == 5:
+            dst_idx = copy_1b(src_buf, src_idx,  4, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 6:
+            dst_idx = copy_1b(src_buf, src_idx,  5, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 7:
+            dst_idx = copy_2b(src_buf, src_idx,  5, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 8:
+            dst_idx = copy_4b(src_buf, src_idx,  0, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  4, dst_buf, dst_idx)
+        elif length == 9:
+            dst_idx = copy_1b(src_buf, src_idx,  8, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 10:
+            dst_idx = copy_1b(src_buf, src_idx,  9, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 11:
+            dst_idx = copy_2b(src_buf, src_idx,  9, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 12:
+            dst_idx = copy_4b(src_buf, src_idx,  8, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 13:
+            dst_idx = copy_1b(src_buf, src_idx, 12, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  8, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 14:
+            dst_idx = copy_1b(src_buf, src_idx, 13, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  9, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 15:
+            dst_idx = copy_2b(src_buf, src_idx, 13, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx,  9, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 16:
+            dst_idx = copy_8b(src_buf, src_idx,  8, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 17:
+            dst_idx = copy_8b(src_buf, src_idx,  9, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  8, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 18:
+            dst_idx = copy_1b(src_buf, src_idx, 17, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 1, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx,  0, dst_buf, dst_idx)
+        elif length == 19:
+            dst_idx = copy_3b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 20:
+            dst_idx = copy_4b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 21:
+            dst_idx = copy_1b(src_buf, src_idx, 20, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 22:
+            dst_idx = copy_2b(src_buf, src_idx, 20, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 23:
+            dst_idx = copy_3b(src_buf, src_idx, 20, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 24:
+            dst_idx = copy_8b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 25:
+            dst_idx = copy_8b(src_buf, src_idx, 17, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 26:
+            dst_idx = copy_1b(src_buf, src_idx, 25, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx, 17, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 27:
+            dst_idx = copy_2b(src_buf, src_idx, 25, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx, 17, dst_buf, dst_idx)
+            dst_idx = copy_1b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 28:
+            dst_idx = copy_4b(src_buf, src_idx, 24, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 29:
+            dst_idx = copy_1b(src_buf, src_idx, 28, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx, 24, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 30:
+            dst_idx = copy_2b(src_buf, src_idx, 28, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx, 24, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx, 16, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 0, dst_buf, dst_idx)
+        elif length == 31:
+            dst_idx = copy_1b(src_buf, src_idx, 30, dst_buf, dst_idx)
+            dst_idx = copy_4b(src_buf, src_idx, 26, dst_buf, dst_idx)
+            dst_idx = copy_8b(src_buf, src_idx, 18, dst_buf, dst_idx)
+            dst_idx = copy_16b(src_buf, src_idx, 2, dst_buf, dst_idx)
+            dst_idx = copy_2b(src_buf, src_idx,  0, dst_buf, dst_idx)
+
+
+class TestR21Decompress(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(0x1021)
+        self.utils = DWGUtils(DWGReport())
+        self.reference = ReferenceUtils(DWGReport())
+
+    def run_both(self, func):
+        results = []
+        for utils in (self.utils, self.reference):
+            try:
+                results.append(func(utils))
+            except Exception as e:
+                results.append(type(e).__name__)
+        return results
+
+    def test_copy_compressed_chunk(self):
+        """Literal runs of 0-300 bytes at various source & destination offsets
+        """
+        for length in range(301):
+            for src_idx, dst_idx in ((0, 0), (3, 0), (0, 5), (7, 11)):
+                src_buf = bytes(self.random.getrandbits(8) for _ in range(src_idx + length))
+
+                def copy(utils):
+                    dst_buf = bytearray(dst_idx + length)
+                    utils.copy_compressed_chunk(src_buf, src_idx, length, dst_buf, dst_idx)
+                    return bytes(dst_buf)
+
+                result, expected = self.run_both(copy)
+                self.assertEqual(result, expected, "length {}".format(length))
+
+    def test_decompress_r21(self):
+        """Random compressed streams (outputs, or raised errors, must be the same)
+        """
+        for trial in range(5000):
+            src_buf = bytes(self.random.getrandbits(8) for _ in range(self.random.randint(1, 600)))
+            dst_size = self.random.choice([64, 256, 1024, 0x7400])
+
+            with redirect_stdout(io.StringIO()):   # copy_bytes() prints abnormal back-references
+                result, expected = self.run_both(lambda utils: utils.decompress_r21(src_buf, dst_size))
+            self.assertEqual(result, expected, "stream {}".format(src_buf.hex()))
+
+    def corrupted(self, utils):
+        return [vinfo for vinfo in utils.report.vinfo if vinfo.type == DWGVType.CORRUPTED]
+
+    def test_decompress_r21_literal_overrun(self):
+        """A literal run past the end of the source is reported and keeps the output size
+        """
+        # opcode 0x02: a literal run of 10 bytes, but only 4 bytes follow
+        out = self.utils.decompress_r21(bytes([0x02]) + b'\x11\x22\x33\x44', 64)
+        self.assertEqual(len(self.corrupted(self.utils)), 1)
+        self.assertEqual(len(out), 64)
+        self.assertEqual(out, bytes(64))
+
+    def test_decompress_r21_literal_exact(self):
+        """A literal run ending exactly at the end of the source is not reported
+        """
+        literal = bytes(range(1, 11))
+        out = self.utils.decompress_r21(bytes([0x02]) + literal, 64)
+        self.assertEqual(self.corrupted(self.utils), [])
+        self.assertEqual(len(out), 64)
+        self.assertEqual(out[:10], bytes(literal[i] for i in R21_CHUNK_ORDER[10]))
+        self.assertEqual(out[10:], bytes(54))
+
+
+if __name__ == '__main__':
+    unittest.main()